@@ -0,0 +1,49 @@
+import heapq
+from itertools import islice
+
+
+def descending(users):
+    # WiGLE returns member lists best first; anything else is sorted once so the merge stays valid
+    if all(a["discovered"] >= b["discovered"] for a, b in zip(users, users[1:])):
+        return users
+    return sorted(users, key=lambda user: user["discovered"], reverse=True)
+
+
+def merge_members(member_lists):
+    # k-way merge of the groups' member lists into one ranking, best first. Members who left
+    # their group are skipped like in /userrank, and a user in several of the groups counts once.
+    seen = set()
+    merged = heapq.merge(*(descending(users) for users in member_lists),
+                         key=lambda user: user["discovered"], reverse=True)
+    for user in merged:
+        if "L" in user.get("status", ""):
+            continue
+        name = user["username"].lower()
+        if name in seen:
+            continue
+        seen.add(name)
+        yield user
+
+
+class LazyPages:
+    # Pulls rows from an iterator only as far as the pages asked for, one row past the last
+    # page to know whether another one follows.
+    def __init__(self, rows, size=10):
+        self.rows = iter(rows)
+        self.size = size
+        self.loaded = []
+        self.exhausted = False
+
+    def fill(self, count):
+        if not self.exhausted and len(self.loaded) < count:
+            self.loaded.extend(islice(self.rows, count - len(self.loaded)))
+            self.exhausted = len(self.loaded) < count
+
+    def page(self, number):
+        start = number * self.size
+        self.fill(start + self.size + 1)
+        return self.loaded[start:start + self.size]
+
+    def has_next(self, number):
+        self.fill((number + 1) * self.size + 1)
+        return len(self.loaded) > (number + 1) * self.size
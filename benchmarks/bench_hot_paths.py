@@ -0,0 +1,135 @@
+# Microbenchmarks for the CPU-bound rendering and pagination paths, on synthetic data of 10 to
+# 50,000 rows. Run from the repository root:
+#
+#   python -m pytest benchmarks/bench_hot_paths.py -s                  # measure and compare
+#   BENCH_SAVE=1 python -m pytest benchmarks/bench_hot_paths.py -s     # save as the new baseline
+#
+# Each case reports the cost of one call (one page click for the views). When a baseline exists
+# a case fails if it got slower than the baseline by more than BENCH_TOLERANCE (default 0.25).
+import json
+import os
+import random
+import sys
+import timeit
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from bench_render import DATA  # noqa: E402
+from views import (AllTime, GroupView, MonthRank, UserRankView, create_user_stats_embed,  # noqa: E402
+                   format_number, user_stats_render_cache)
+
+ROW_COUNTS = (10, 1000, 50000)
+BASELINE_PATH = os.environ.get("BENCH_BASELINE", os.path.join(os.path.dirname(__file__), "baseline.json"))
+TOLERANCE = float(os.environ.get("BENCH_TOLERANCE", "0.25"))
+SAVE = os.environ.get("BENCH_SAVE") == "1"
+
+results = {}
+
+
+def load_baseline():
+    try:
+        with open(BASELINE_PATH, "r") as baseline_file:
+            return json.load(baseline_file)
+    except FileNotFoundError:
+        return {}
+
+
+baseline = load_baseline()
+
+
+@pytest.fixture(scope="module", autouse=True)
+def report():
+    yield
+    print(f"\n{'case':<40} {'us/call':>12} {'baseline':>12}")
+    for name, per_call in results.items():
+        previous = baseline.get(name)
+        print(f"{name:<40} {per_call:>12.2f} {previous if previous is not None else '-':>12}")
+    if SAVE:
+        with open(BASELINE_PATH, "w") as baseline_file:
+            json.dump(results, baseline_file, indent=2, sort_keys=True)
+        print(f"Saved baseline to {BASELINE_PATH}")
+
+
+def measure(name, fn):
+    timer = timeit.Timer(fn)
+    number, _ = timer.autorange()
+    per_call = min(timer.repeat(repeat=3, number=number)) / number * 1e6
+    results[name] = round(per_call, 3)
+
+    previous = baseline.get(name)
+    if previous is not None and not SAVE:
+        assert per_call <= previous * (1 + TOLERANCE), \
+            f"{name} regressed: {per_call:.2f} us/call against a baseline of {previous:.2f}"
+
+
+def rng(rows):
+    return random.Random(rows)
+
+
+def users(rows):
+    r = rng(rows)
+    return [{"username": f"user{i}", "discovered": r.randrange(10 ** 7), "status": r.choice(["A", "A", "A", "L"])}
+            for i in range(rows)]
+
+
+def groups(rows):
+    r = rng(rows)
+    return [{"groupName": f"group{i}", "groupId": f"id{i}", "discovered": r.randrange(10 ** 9)} for i in range(rows)]
+
+
+def standings(rows):
+    r = rng(rows)
+    return [{"userName": f"user{i}", "discoveredWiFiGPS": r.randrange(10 ** 7), "eventMonthCount": r.randrange(10 ** 5)}
+            for i in range(rows)]
+
+
+def user_payloads(rows):
+    r = rng(rows)
+    return [{**DATA, "statistics": {**DATA["statistics"], "userName": f"user{i}", "rank": r.randrange(1, 10 ** 6)}}
+            for i in range(rows)]
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_format_number(rows):
+    numbers = [random.Random(rows).randrange(10 ** 9) for _ in range(rows)]
+    measure(f"format_number[{rows}]", lambda: [format_number(number) for number in numbers])
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_create_user_stats_embed(rows):
+    # Cycles through `rows` distinct users, so large fixtures mostly miss the render cache
+    payloads = user_payloads(rows)
+    position = iter(range(10 ** 12))
+    user_stats_render_cache.entries.clear()
+    measure(f"create_user_stats_embed[{rows}]",
+            lambda: create_user_stats_embed(payloads[next(position) % rows], 0))
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_user_rank_view_update_button(rows):
+    view = UserRankView(users(rows), "bench")
+    view.page = rows // 20
+    measure(f"UserRankView.update_button[{rows}]", view.update_button)
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_group_view_get_embed(rows):
+    view = GroupView(groups(rows))
+    view.page = rows // 20
+    measure(f"GroupView.get_embed[{rows}]", view.get_embed)
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_alltime_get_embed(rows):
+    view = AllTime(standings(rows))
+    view.page = rows // 20
+    measure(f"AllTime.get_embed[{rows}]", view.get_embed)
+
+
+@pytest.mark.parametrize("rows", ROW_COUNTS)
+def test_month_rank_get_embed(rows):
+    view = MonthRank(standings(rows))
+    view.page = rows // 20
+    measure(f"MonthRank.get_embed[{rows}]", view.get_embed)
@@ -0,0 +1,112 @@
+# Compares the memory the gateway state holds in the default and low-memory modes, with 1,000,
+# 10,000 and 50,000 simulated guilds. Run from the repository root:
+#
+#   python benchmarks/bench_memory.py                # all three sizes
+#   python benchmarks/bench_memory.py 1000 5000      # chosen sizes
+#
+# Each guild is fed to discord.py's connection state as the GUILD_CREATE payload its intents
+# would produce: channels, roles and emojis always, plus the voice states and the members in
+# voice when the voice states intent is on. Then the gateway delivers MESSAGE_CREATE events
+# (with content only when the message content intent is on) into the message cache. The figure
+# is the memory still allocated afterwards, measured with tracemalloc.
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import discord  # noqa: E402
+
+from gateway import gateway_options  # noqa: E402
+
+GUILD_COUNTS = (1000, 10000, 50000)
+CHANNELS, ROLES, EMOJIS, VOICE_MEMBERS = 10, 5, 5, 2
+MESSAGES = 5000
+BOT_ID = 1
+
+
+def user(user_id):
+    return {"id": str(user_id), "username": f"user{user_id}", "discriminator": "0", "global_name": None,
+            "avatar": None}
+
+
+def member(user_id):
+    return {"user": user(user_id), "roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "deaf": False,
+            "mute": False, "flags": 0}
+
+
+def guild_payload(guild_id, intents):
+    base = guild_id * 100
+    payload = {
+        "id": str(guild_id), "name": f"guild{guild_id}", "owner_id": str(base + 50), "member_count": 250,
+        "icon": None, "features": [], "large": False, "unavailable": False, "stickers": [],
+        "roles": [{"id": str(guild_id if i == 0 else base + i), "name": f"role{i}", "permissions": "0",
+                   "position": i, "color": 0} for i in range(ROLES)],
+        "emojis": [{"id": str(base + 10 + i), "name": f"emoji{i}", "roles": [], "require_colons": True,
+                    "managed": False, "animated": False, "available": True} for i in range(EMOJIS)],
+        "channels": [{"id": str(base + 20 + i), "type": 2 if i == 0 else 0, "name": f"channel{i}", "position": i,
+                      "permission_overwrites": [], "bitrate": 64000, "user_limit": 0} for i in range(CHANNELS)],
+        "members": [member(BOT_ID)],
+        "voice_states": [],
+    }
+    if intents.voice_states:
+        for i in range(VOICE_MEMBERS):
+            payload["members"].append(member(base + 40 + i))
+            payload["voice_states"].append({"user_id": str(base + 40 + i), "channel_id": str(base + 20),
+                                            "session_id": "x", "deaf": False, "mute": False, "self_deaf": False,
+                                            "self_mute": False, "self_video": False, "suppress": False})
+    return payload
+
+
+def message_payload(message_id, guild_id, intents):
+    base = guild_id * 100
+    return {"id": str(message_id), "channel_id": str(base + 21), "guild_id": str(guild_id), "type": 0,
+            "author": user(base + 60), "member": {"roles": [], "joined_at": "2024-01-01T00:00:00+00:00", "flags": 0},
+            "content": "Has anyone mapped the new industrial park yet? " * 4 if intents.message_content else "",
+            "timestamp": "2024-01-01T00:00:00+00:00", "edited_timestamp": None, "tts": False,
+            "mention_everyone": False, "mentions": [], "mention_roles": [], "attachments": [], "embeds": [],
+            "pinned": False}
+
+
+def measure(low_memory, guild_count):
+    options = gateway_options(low_memory)
+    intents = options["intents"]
+    client = discord.Client(**options)
+    state = client._connection
+    state.user = discord.ClientUser(state=state, data=user(BOT_ID))
+
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    for guild_id in range(1, guild_count + 1):
+        state._add_guild_from_data(guild_payload(guild_id, intents))
+    if intents.guild_messages:
+        for message_id in range(MESSAGES):
+            data = message_payload(10 ** 12 + message_id, message_id % guild_count + 1, intents)
+            channel, _ = state._get_guild_channel(data)
+            message = discord.Message(state=state, channel=channel, data=data)
+            if state._messages is not None:
+                state._messages.append(message)
+    elapsed = time.perf_counter() - started
+    gc.collect()
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    members = sum(len(guild._members) for guild in state._guilds.values())
+    cached = len(state._messages) if state._messages is not None else 0
+    return allocated, members, cached, elapsed
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or GUILD_COUNTS
+    print(f"{'guilds':>8} {'mode':<8} {'MiB':>9} {'KiB/guild':>10} {'members':>9} {'messages':>9} {'seconds':>8}")
+    for guild_count in counts:
+        for low_memory in (False, True):
+            allocated, members, cached, elapsed = measure(low_memory, guild_count)
+            print(f"{guild_count:>8} {'low' if low_memory else 'default':<8} {allocated / 2 ** 20:>9.1f} "
+                  f"{allocated / 1024 / guild_count:>10.2f} {members:>9} {cached:>9} {elapsed:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
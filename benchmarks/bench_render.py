@@ -0,0 +1,49 @@
+# Compares the cost of rendering the user stats embed from scratch with serving it from the
+# render cache. Run from the repository root: python benchmarks/bench_render.py
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from views import create_user_stats_embed, render_user_stats_embed, user_stats_render_cache  # noqa: E402
+
+DATA = {
+    "success": True,
+    "imageBadgeUrl": "/bi/kavitate.png",
+    "statistics": {
+        "userName": "kavitate",
+        "rank": 1234,
+        "monthRank": 56,
+        "prevRank": 1240,
+        "prevMonthRank": 60,
+        "eventMonthCount": 12345,
+        "eventPrevMonthCount": 23456,
+        "discoveredWiFiGPS": 1234567,
+        "discoveredWiFiGPSPercent": 98.7,
+        "discoveredWiFi": 1300000,
+        "discoveredCellGPS": 4567,
+        "discoveredCell": 5000,
+        "discoveredBtGPS": 78901,
+        "discoveredBt": 80000,
+        "totalWiFiLocations": 9876543,
+        "last": "20240101-123456",
+        "first": "20180505-101010",
+    },
+}
+
+
+def main(number=20000):
+    uncached = timeit.timeit(lambda: render_user_stats_embed(DATA), number=number)
+
+    user_stats_render_cache.entries.clear()
+    create_user_stats_embed(DATA, 0)
+    cached = timeit.timeit(lambda: create_user_stats_embed(DATA, 0), number=number)
+
+    print(f"render from scratch: {uncached / number * 1e6:8.2f} us/embed")
+    print(f"render cache hit:    {cached / number * 1e6:8.2f} us/embed")
+    print(f"speedup:             {uncached / cached:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+# Runs the slash commands and the /wigle button menu on a single client.
+#
+# Nothing is imported at module level: chart workers are spawned processes that re-import the
+# main script, and importing the front-ends there would build a second bot in every worker.
+
+
+def run_discord_bot():
+    import gui_commands  # noqa: F401
+    import slash_commands  # noqa: F401
+    from wigle_core import run_discord_bot as run
+
+    run()
+
+
+if __name__ == "__main__":
+    run_discord_bot()
@@ -0,0 +1,66 @@
+import logging
+import time
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    # Closed: requests flow normally. After `threshold` consecutive failures the breaker opens and
+    # requests fail fast for `cooldown` seconds. It then goes half-open and lets a single probe
+    # through; a successful probe closes it, a failed one opens it for another cooldown.
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half-open"
+
+    def __init__(self, name, threshold=5, cooldown=30, metrics=None):
+        self.name = name
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.metrics = metrics
+        self.state = self.CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probing = False
+
+    def allow(self):
+        if self.state == self.OPEN and time.monotonic() - self.opened_at >= self.cooldown:
+            self._transition(self.HALF_OPEN)
+            self.probing = False
+
+        if self.state == self.HALF_OPEN:
+            if self.probing:
+                return False
+            self.probing = True
+            return True
+
+        return self.state == self.CLOSED
+
+    def check(self):
+        if not self.allow():
+            raise CircuitOpenError(f"WiGLE {self.name} endpoint is unavailable")
+
+    def record_success(self):
+        self.failures = 0
+        self.probing = False
+        if self.state != self.CLOSED:
+            self._transition(self.CLOSED)
+
+    def record_failure(self):
+        self.failures += 1
+        self.probing = False
+        if self.state == self.HALF_OPEN or self.failures >= self.threshold:
+            self.opened_at = time.monotonic()
+            if self.state != self.OPEN:
+                self._transition(self.OPEN)
+
+    def abandon(self):
+        # The request ended without telling us anything about the endpoint (e.g. it was cancelled)
+        self.probing = False
+
+    def _transition(self, state):
+        logging.warning(f"Circuit breaker for WiGLE {self.name} endpoint: {self.state} -> {state}")
+        self.state = state
+        if self.metrics is not None:
+            self.metrics.incr(f"breaker.{self.name}.{state}")
@@ -0,0 +1,33 @@
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    # Bounded LRU mapping whose entries expire `ttl` seconds after they were stored.
+    def __init__(self, maxsize=1024, ttl=300):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.entries = OrderedDict()
+
+    def get(self, key, default=None):
+        entry = self.entries.get(key)
+        if entry is None:
+            return default
+        value, expires = entry
+        if expires <= time.monotonic():
+            del self.entries[key]
+            return default
+        self.entries.move_to_end(key)
+        return value
+
+    def set(self, key, value, ttl=None):
+        self.entries[key] = (value, time.monotonic() + (ttl if ttl is not None else self.ttl))
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def __contains__(self, key):
+        return self.get(key) is not None
+
+    def __len__(self):
+        return len(self.entries)
@@ -0,0 +1,100 @@
+import asyncio
+import hashlib
+import io
+import json
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+
+from cache import TTLCache
+
+try:
+    import matplotlib
+except ImportError:
+    matplotlib = None
+
+
+def draw_history_chart(title, series):
+    # Runs in a worker process. `series` is a list of (timestamp, rank, discovered) rows.
+    matplotlib.use("Agg")
+    from matplotlib import dates, pyplot
+
+    times = [datetime.fromtimestamp(ts) for ts, _, _ in series]
+    ranks = [rank for _, rank, _ in series]
+    discovered = [count for _, _, count in series]
+
+    figure, (rank_axis, discovered_axis) = pyplot.subplots(2, 1, sharex=True, figsize=(8, 5), dpi=100)
+    figure.suptitle(title)
+    rank_axis.plot(times, ranks, color="#1E90FF", marker=".")
+    rank_axis.set_ylabel("Rank")
+    rank_axis.invert_yaxis()
+    rank_axis.grid(alpha=0.3)
+    discovered_axis.plot(times, discovered, color="#FF00FF", marker=".")
+    discovered_axis.set_ylabel("Discovered")
+    discovered_axis.grid(alpha=0.3)
+    discovered_axis.xaxis.set_major_formatter(dates.DateFormatter("%Y-%m-%d"))
+    figure.autofmt_xdate()
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png")
+    pyplot.close(figure)
+    return buffer.getvalue()
+
+
+class ChartRenderer:
+    # Renders charts in a small process pool so matplotlib never runs on the event loop.
+    # Finished PNGs are cached by a hash of their input data, and concurrent requests for the
+    # same chart share one render. Workers are spawned rather than forked because the bot
+    # process has threads (log listener, loop watchdog) running by the time charts are drawn.
+    def __init__(self, workers=2, cache_size=128, ttl=3600, metrics=None):
+        self.workers = workers
+        self.cache = TTLCache(maxsize=cache_size, ttl=ttl)
+        self.metrics = metrics
+        self.pending = {}
+        self.pool = None
+
+    @property
+    def available(self):
+        return matplotlib is not None
+
+    def key(self, title, series, draw):
+        return hashlib.sha256(json.dumps([draw.__name__, title, series]).encode()).hexdigest()
+
+    def cached(self, title, series, draw=draw_history_chart):
+        return self.cache.get(self.key(title, series, draw))
+
+    async def render(self, title, series, draw=draw_history_chart):
+        key = self.key(title, series, draw)
+        png = self.cache.get(key)
+        if png is not None:
+            self.count("charts.cached")
+            return png
+
+        if key not in self.pending:
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"))
+            self.count("charts.rendered")
+            self.pending[key] = asyncio.get_running_loop().run_in_executor(self.pool, draw, title, series)
+            self.pending[key].add_done_callback(lambda future: self.finish(key, future))
+        return await asyncio.shield(self.pending[key])
+
+    def finish(self, key, future):
+        del self.pending[key]
+        if not future.cancelled() and future.exception() is None:
+            self.cache.set(key, future.result())
+        elif not future.cancelled():
+            logging.error(f"Failed to render chart: {future.exception()}")
+            if isinstance(future.exception(), BrokenProcessPool):
+                # A worker died; start a fresh pool for the next chart
+                self.close()
+
+    def count(self, name):
+        if self.metrics is not None:
+            self.metrics.incr(name)
+
+    def close(self):
+        if self.pool is not None:
+            self.pool.shutdown(wait=False, cancel_futures=True)
+            self.pool = None
@@ -0,0 +1,158 @@
+import asyncio
+import gzip
+import json
+import logging
+import mmap
+import os
+import time
+from array import array
+
+STATE_VERSION = 1
+
+
+def write_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as state_file:
+        state_file.write(data)
+    os.replace(tmp_path, path)
+
+
+def map_column(path):
+    # Rank columns are raw int64 arrays, mapped instead of read so startup does not copy them
+    with open(path, "rb") as column_file:
+        if os.fstat(column_file.fileno()).st_size == 0:
+            return array("q")
+        return memoryview(mmap.mmap(column_file.fileno(), 0, access=mmap.ACCESS_READ)).cast("q")
+
+
+class Checkpoint:
+    # Saves the bot's warm state to `directory` every `interval` seconds and on shutdown, and
+    # restores it at startup so a restart does not begin with a burst of cold requests. Saved
+    # responses keep their fetch time: on load each one goes back into the stale fallback for
+    # the rest of its stale TTL, and into the response cache only if it is still fresh there.
+    # A checkpoint older than `max_age` is ignored as a whole.
+    def __init__(self, bot, directory, cache_ttls, interval=600, max_age=86400):
+        self.bot = bot
+        self.directory = directory
+        self.cache_ttls = cache_ttls
+        self.interval = interval
+        self.max_age = max_age
+        self.task = None
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        # Writes the final checkpoint, so it must run before the bot's state is torn down
+        if self.task is None:
+            return
+        self.task.cancel()
+        try:
+            await self.task
+        except asyncio.CancelledError:
+            pass
+        self.task = None
+        await self.save()
+
+    async def run(self):
+        while True:
+            await asyncio.sleep(self.interval)
+            await self.save()
+
+    async def save(self):
+        started = time.perf_counter()
+        try:
+            state = self.collect()
+            # write() moves the rank columns out of the state, so count them first
+            responses, ranks = len(state["responses"]), len(state["rank_names"])
+            await asyncio.to_thread(self.write, state)
+            logging.info(f"Checkpoint saved {responses} responses and {ranks} ranks "
+                         f"in {time.perf_counter() - started:.2f}s")
+        except Exception as e:
+            logging.error(f"Failed to save checkpoint to {self.directory}: {e}")
+
+    def collect(self):
+        # Runs on the event loop and only copies references; serializing happens in write()
+        bot = self.bot
+        responses = [[list(key), data, fetched_at]
+                     for key, ((data, fetched_at), _) in list(bot.last_good.entries.items())]
+        return {
+            "version": STATE_VERSION,
+            "saved_at": time.time(),
+            "responses": responses,
+            "usernames": list(bot.usernames.names.values()),
+            "group_names": list(bot.group_names.names.values()),
+            "group_names_updated": bot.group_names.updated,
+            "crawler_cursor": bot.standings_crawler.cursor,
+            "region_boards": dict(bot.region_boards.tables),
+            "memberships": dict(bot.memberships.groups),
+            "rank_names": list(bot.rank_index.names),
+            "ranks": bot.rank_index.ranks.tobytes(),
+            "discovered": bot.rank_index.discovered.tobytes(),
+        }
+
+    def write(self, state):
+        os.makedirs(self.directory, exist_ok=True)
+        write_atomic(self.path("ranks.bin"), state.pop("ranks"))
+        write_atomic(self.path("discovered.bin"), state.pop("discovered"))
+        write_atomic(self.path("rank_names.txt"), "\n".join(state.pop("rank_names")).encode())
+        # Written last: a checkpoint without a matching state.json.gz is never loaded
+        write_atomic(self.path("state.json.gz"), gzip.compress(json.dumps(state, separators=(",", ":")).encode(), 6))
+
+    async def load(self):
+        try:
+            state = await asyncio.to_thread(self.read)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            logging.error(f"Ignoring unreadable checkpoint in {self.directory}: {e}")
+            return
+        if state is not None:
+            self.apply(state)
+
+    def read(self):
+        with open(self.path("state.json.gz"), "rb") as state_file:
+            state = json.loads(gzip.decompress(state_file.read()))
+        age = time.time() - state.get("saved_at", 0)
+        if state.get("version") != STATE_VERSION or age > self.max_age:
+            logging.info(f"Ignoring checkpoint in {self.directory}, saved {age:.0f}s ago")
+            return None
+
+        ranks = map_column(self.path("ranks.bin"))
+        discovered = map_column(self.path("discovered.bin"))
+        with open(self.path("rank_names.txt"), "r") as names_file:
+            names = names_file.read().split("\n") if len(ranks) else []
+        if not len(ranks) == len(discovered) == len(names):
+            logging.warning(f"Ignoring rank index in {self.directory}, its columns do not match")
+            ranks, discovered, names = array("q"), array("q"), []
+        state["rank_index"] = (ranks, discovered, names)
+        return state
+
+    def apply(self, state):
+        bot = self.bot
+        now = time.time()
+        restored = 0
+        for key, data, fetched_at in state["responses"]:
+            key = tuple(key)
+            age = now - fetched_at
+            if key[0] not in self.cache_ttls or age >= bot.last_good.ttl:
+                continue
+            bot.last_good.set(key, (data, fetched_at), bot.last_good.ttl - age)
+            if age < self.cache_ttls[key[0]]:
+                bot.cache.set(key, data, self.cache_ttls[key[0]] - age)
+            restored += 1
+
+        bot.usernames.add_many(state["usernames"])
+        bot.group_names.add_many(state["group_names"])
+        bot.group_names.updated = state["group_names_updated"]
+        bot.rank_index.load(*state["rank_index"])
+        bot.standings_crawler.cursor = state["crawler_cursor"]
+        bot.region_boards.tables.update(state.get("region_boards", {}))
+        for group_id, group in state.get("memberships", {}).items():
+            bot.memberships.update(group_id, group["name"], group["discovered"], group["usernames"])
+        logging.info(f"Checkpoint restored {restored} responses and {len(bot.rank_index)} ranks "
+                     f"saved {now - state['saved_at']:.0f}s ago")
@@ -0,0 +1,28 @@
+import time
+
+
+class DeadlineExceeded(Exception):
+    pass
+
+
+class Deadline:
+    # Time budget for one command, passed down to every upstream call it makes so timeouts,
+    # rate-limit waits and retries all draw from the same remaining time.
+    def __init__(self, budget):
+        self.budget = budget
+        self.started = time.monotonic()
+        self.expires = self.started + budget
+
+    def remaining(self):
+        return max(0.0, self.expires - time.monotonic())
+
+    def elapsed(self):
+        return time.monotonic() - self.started
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def check(self):
+        if self.expired:
+            raise DeadlineExceeded(f"{self.budget}s budget exhausted")
@@ -0,0 +1,50 @@
+import csv
+import gzip
+import io
+import json
+import tempfile
+
+
+def write_export(rows, fmt, max_memory=1024 * 1024):
+    # Streams `rows` (an iterable of dicts) as gzipped CSV or NDJSON into a temporary file that
+    # stays in memory up to `max_memory` bytes and spills to disk beyond that, so the size of an
+    # export is bounded by the upload limit rather than by RAM. Returns the file rewound to the
+    # start, the number of rows and the compressed size. discord.File only accepts the spool as a
+    # file object on Python 3.11+, where SpooledTemporaryFile is an io.IOBase.
+    spool = tempfile.SpooledTemporaryFile(max_size=max_memory)
+    count = 0
+    with gzip.GzipFile(fileobj=spool, mode="wb", mtime=0) as compressed:
+        text = io.TextIOWrapper(compressed, encoding="utf-8", newline="")
+        writer = None
+        for row in rows:
+            if fmt == "csv":
+                if writer is None:
+                    writer = csv.DictWriter(text, fieldnames=list(row), extrasaction="ignore")
+                    writer.writeheader()
+                writer.writerow(row)
+            else:
+                text.write(json.dumps(row, separators=(",", ":")) + "\n")
+            count += 1
+        text.flush()
+        text.detach()
+
+    size = spool.tell()
+    spool.seek(0)
+    return spool, count, size
+
+
+def group_rows(users):
+    # Members who left are not ranked, the same as in /userrank
+    active = (user for user in users if "L" not in user.get("status", ""))
+    for rank, user in enumerate(active, start=1):
+        yield {"rank": rank, **user}
+
+
+def standings_rows(results):
+    for rank, result in enumerate(results, start=1):
+        yield {"rank": result.get("rank", rank), **result}
+
+
+def rank_index_rows(ranks, names, discovered):
+    for rank, name, count in zip(ranks, names, discovered):
+        yield {"rank": rank, "userName": name, "discoveredWiFiGPS": count}
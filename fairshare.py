@@ -0,0 +1,102 @@
+import asyncio
+import contextvars
+from collections import deque
+
+from cache import TTLCache
+from ratelimit import RateLimiter
+
+# Who the current upstream request is made for: ("guild", id), ("user", id) in DMs, or None for
+# background jobs. Set around command execution so wigle_get can pick the right queue.
+current_tenant = contextvars.ContextVar("current_tenant", default=None)
+BACKGROUND = ("background",)
+
+
+class FairScheduler:
+    # Sits in front of the shared API limiter. Commands that need WiGLE first spend one unit of
+    # their user's and their guild's quota; a caller over quota is told when to retry instead of
+    # queueing. Admitted requests wait in one queue per tenant, and whenever the limiter frees a
+    # slot it goes to the tenant picked by smooth weighted round-robin, so a busy guild only
+    # delays its own requests. Cache hits never reach the scheduler and are always free.
+    def __init__(self, limiter, user_rate=10, guild_rate=30, per=60, weights=None, background_weight=1):
+        self.limiter = limiter
+        self.user_rate = user_rate
+        self.guild_rate = guild_rate
+        self.per = per
+        self.weights = weights or {}
+        self.background_weight = background_weight
+        self.quotas = TTLCache(maxsize=10000, ttl=per * 10)
+        self.queues = {}
+        self.current = {}
+        self.dispatcher = None
+
+    def quota(self, key, rate):
+        bucket = self.quotas.get(key)
+        if bucket is None:
+            bucket = RateLimiter(rate, per=self.per)
+        self.quotas.set(key, bucket)
+        return bucket
+
+    def admit(self, guild_id, user_id):
+        # Returns 0 if the command may call WiGLE, otherwise the seconds until it may
+        user_quota = self.quota(("user", user_id), self.user_rate)
+        retry_after = user_quota.try_acquire()
+        if retry_after or guild_id is None:
+            return retry_after
+
+        retry_after = self.quota(("guild", guild_id), self.guild_rate).try_acquire()
+        if retry_after:
+            user_quota.tokens += 1
+        return retry_after
+
+    @staticmethod
+    def tenant(guild_id, user_id):
+        return ("guild", guild_id) if guild_id is not None else ("user", user_id)
+
+    def weight(self, tenant):
+        if tenant == BACKGROUND:
+            return self.background_weight
+        return self.weights.get(str(tenant[1]), 1)
+
+    async def acquire(self, tenant=None):
+        tenant = tenant or BACKGROUND
+        if not self.queues and self.limiter.try_acquire() == 0:
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self.queues.setdefault(tenant, deque()).append(future)
+        if self.dispatcher is None:
+            self.dispatcher = asyncio.create_task(self.dispatch())
+        await future
+
+    async def dispatch(self):
+        try:
+            while self.queues:
+                await self.limiter.acquire()
+                while self.queues:
+                    future = self.next_waiter()
+                    if not future.done():
+                        future.set_result(None)
+                        break
+                else:
+                    # Every waiter gave up (e.g. its deadline passed), keep the slot
+                    self.limiter.tokens += 1
+        finally:
+            self.dispatcher = None
+
+    def next_waiter(self):
+        total = 0
+        chosen = None
+        for tenant in self.queues:
+            weight = self.weight(tenant)
+            self.current[tenant] = self.current.get(tenant, 0) + weight
+            total += weight
+            if chosen is None or self.current[tenant] > self.current[chosen]:
+                chosen = tenant
+        self.current[chosen] -= total
+
+        queue = self.queues[chosen]
+        future = queue.popleft()
+        if not queue:
+            del self.queues[chosen]
+            del self.current[chosen]
+        return future
@@ -0,0 +1,102 @@
+import heapq
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter, defaultdict
+
+
+def trigrams(text):
+    padded = f"  {text.lower()} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class TrigramIndex:
+    # Names the bot has seen in WiGLE responses, indexed by trigram for "did you mean"
+    # suggestions (ranked by Dice similarity of trigram sets) and by sorted lowercase name for
+    # prefix autocomplete. Lookups never touch the API. Postings hold integer ids and each name's
+    # trigram count is kept at insert time, so a lookup never splits a candidate name again.
+    def __init__(self, min_score=0.3):
+        self.min_score = min_score
+        self.names = {}
+        self.keys = []
+        self.sizes = array("H")
+        self.postings = defaultdict(lambda: array("I"))
+        self.sorted_names = []
+        self.dirty = False
+        self.updated = 0.0
+
+    def add(self, name):
+        key = name.lower()
+        if key in self.names:
+            return
+        self.names[key] = name
+        grams = trigrams(key)
+        ident = len(self.keys)
+        self.keys.append(key)
+        self.sizes.append(len(grams))
+        for gram in grams:
+            self.postings[gram].append(ident)
+        self.sorted_names.append(key)
+        self.dirty = True
+
+    def add_many(self, names):
+        for name in names:
+            self.add(name)
+        self.updated = time.time()
+
+    def replace(self, names):
+        # For sources that list every name, e.g. the full group list
+        self.names = {}
+        self.keys = []
+        self.sizes = array("H")
+        self.postings = defaultdict(lambda: array("I"))
+        self.sorted_names = []
+        self.add_many(names)
+
+    def __contains__(self, name):
+        return name.lower() in self.names
+
+    def exact(self, name):
+        return self.names.get(name.lower()) == name
+
+    def __len__(self):
+        return len(self.names)
+
+    def suggest(self, query, limit=3):
+        # A name can only reach min_score if it shares at least `needed` trigrams with the query
+        # and has at most `longest` of its own, so everything else is dropped before scoring
+        query_grams = trigrams(query)
+        size = len(query_grams)
+        needed = max(1, int(self.min_score * size / (2 - self.min_score)))
+        longest = size * (2 - self.min_score) / self.min_score
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.postings.get(gram, ()))
+
+        sizes = self.sizes
+        scored = [(2 * count / (size + sizes[ident]), ident) for ident, count in shared.items()
+                  if count >= needed and sizes[ident] <= longest]
+        best = heapq.nlargest(limit, ((score, self.keys[ident]) for score, ident in scored if score >= self.min_score))
+        return [self.names[key] for _, key in best]
+
+    def complete(self, prefix, limit=25):
+        # Prefix matches in alphabetical order, topped up with fuzzy matches for typos
+        if self.dirty:
+            # New names sit unsorted at the end; sort() merges that run into the sorted rest
+            self.sorted_names.sort()
+            self.dirty = False
+        prefix = prefix.lower()
+        matches = []
+        position = bisect_left(self.sorted_names, prefix)
+        while position < len(self.sorted_names) and len(matches) < limit:
+            key = self.sorted_names[position]
+            if not key.startswith(prefix):
+                break
+            matches.append(self.names[key])
+            position += 1
+
+        if prefix and len(matches) < limit:
+            for name in self.suggest(prefix, limit):
+                if name not in matches and len(matches) < limit:
+                    matches.append(name)
+        return matches
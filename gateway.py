@@ -0,0 +1,20 @@
+import discord
+
+
+def gateway_options(low_memory=False):
+    # Keyword arguments for discord.Client. The bot only answers interactions, which arrive
+    # whatever the intents, so the low-memory mode keeps just what it reads: the guild and channel
+    # cache (server count, digest and watch channels) and the raw message delete events that stop
+    # outbound edits to deleted messages. Members and messages are never cached and guilds are
+    # never chunked, which saves the member and message caches; memory still grows with each
+    # server's channels, roles and emojis.
+    if not low_memory:
+        intents = discord.Intents.default()
+        intents.message_content = True
+        return {"intents": intents}
+
+    intents = discord.Intents.none()
+    intents.guilds = True
+    intents.guild_messages = True
+    return {"intents": intents, "member_cache_flags": discord.MemberCacheFlags.none(),
+            "max_messages": None, "chunk_guilds_at_startup": False}
@@ -0,0 +1,64 @@
+from array import array
+
+from cache import TTLCache
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+PERCENTILES = (25, 75, 90, 99)
+TOP_N = 10
+
+# Computed stats keyed by (group id, time the member list was fetched); a snapshot never changes
+group_stats_cache = TTLCache(maxsize=256, ttl=float("inf"))
+
+
+def member_columns(users):
+    # One pass over the member dicts into flat columns; everything else works on the columns
+    count = len(users)
+    if numpy is not None:
+        discovered = numpy.fromiter((user.get("discovered") or 0 for user in users), dtype=numpy.int64, count=count)
+        left = numpy.fromiter(("L" in (user.get("status") or "") for user in users), dtype=bool, count=count)
+        return numpy.sort(discovered), int(left.sum())
+    discovered = array("q", sorted(user.get("discovered") or 0 for user in users))
+    left = sum("L" in (user.get("status") or "") for user in users)
+    return discovered, left
+
+
+def percentile(ordered, pct):
+    # Nearest rank on an ascending column, same as Metrics.percentile
+    return int(ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))])
+
+
+def group_stats(users):
+    discovered, left = member_columns(users)
+    count = len(discovered)
+    if count == 0:
+        return {"members": 0, "active": 0, "left": 0, "total": 0, "mean": 0, "median": 0,
+                "percentiles": {pct: 0 for pct in PERCENTILES}, "top_share": 0.0}
+
+    total = int(discovered.sum()) if numpy is not None else sum(discovered)
+    top = int(discovered[-TOP_N:].sum()) if numpy is not None else sum(discovered[-TOP_N:])
+    middle = count // 2
+    median = discovered[middle] if count % 2 else (discovered[middle - 1] + discovered[middle]) / 2
+    return {
+        "members": count,
+        "active": count - left,
+        "left": left,
+        "total": total,
+        "mean": total / count,
+        "median": float(median),
+        "percentiles": {pct: percentile(discovered, pct) for pct in PERCENTILES},
+        "top_share": top / total if total else 0.0,
+    }
+
+
+def cached_group_stats(group_id, users, fetched_at):
+    key = (group_id, fetched_at)
+    stats = group_stats_cache.get(key) if fetched_at is not None else None
+    if stats is None:
+        stats = group_stats(users)
+        if fetched_at is not None:
+            group_stats_cache.set(key, stats)
+    return stats
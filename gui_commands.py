@@ -0,0 +1,94 @@
+import discord
+from discord import ButtonStyle
+from discord.ui import Button, View
+
+import handlers
+from wigle_core import client
+
+
+class WigleCommandView(View):
+    def __init__(self, bot):
+        super().__init__()
+        self.bot = bot
+        # Initialize buttons with their respective labels and unique custom_id
+        self.add_item(Button(label="User Stats", style=ButtonStyle.blurple, custom_id="user_stats"))
+        self.add_item(Button(label="Group Rank", style=ButtonStyle.blurple, custom_id="group_rank"))
+        self.add_item(Button(label="All-Time Rankings", style=ButtonStyle.blurple, custom_id="alltime_rankings"))
+        self.add_item(Button(label="Monthly Rankings", style=ButtonStyle.blurple, custom_id="monthly_rankings"))
+        self.add_item(Button(label="User Rankings for Group", style=ButtonStyle.blurple, custom_id="user_rankings_for_group"))
+        self.add_item(Button(label="Credits", style=ButtonStyle.blurple, custom_id="credits"))
+
+    async def on_timeout(self):
+        for item in self.children:
+            item.disabled = True
+
+    # Individual callback methods for each button
+    async def user_stats_callback(self, interaction: discord.Interaction, button: discord.ui.Button):
+        modal = UserStatsModal(bot=self.bot)
+        await interaction.response.send_modal(modal)
+
+    async def group_rank_callback(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await handlers.show_group_rank(interaction)
+
+    async def alltime_rankings_callback(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await handlers.show_alltime_rank(interaction)
+
+    async def monthly_rankings_callback(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await handlers.show_month_rank(interaction)
+
+    async def user_rankings_for_group_callback(self, interaction: discord.Interaction, button: discord.ui.Button):
+        modal = GroupNameModal(bot=self.bot)
+        await interaction.response.send_modal(modal)
+
+    async def credits_callback(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await handlers.show_credits(interaction)
+
+    # Handle button interactions
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        custom_id_to_callback = {
+            "user_stats": self.user_stats_callback,
+            "group_rank": self.group_rank_callback,
+            "alltime_rankings": self.alltime_rankings_callback,
+            "monthly_rankings": self.monthly_rankings_callback,
+            "user_rankings_for_group": self.user_rankings_for_group_callback,
+            "credits": self.credits_callback
+        }
+
+        button = discord.utils.get(self.children, custom_id=interaction.data['custom_id'])
+
+        if button and button.custom_id in custom_id_to_callback:
+            await custom_id_to_callback[button.custom_id](interaction, button)
+            return True
+        return False
+
+
+class UserStatsModal(discord.ui.Modal):
+    def __init__(self, bot):
+        super().__init__(title="Enter WiGLE Username")
+        self.bot = bot
+
+        self.username = discord.ui.TextInput(label="Username", placeholder="Enter the WiGLE username here")
+        self.add_item(self.username)
+
+    async def on_submit(self, interaction: discord.Interaction):
+        username = self.username.value
+        await handlers.show_user_stats(interaction, username)
+
+
+class GroupNameModal(discord.ui.Modal):
+    def __init__(self, bot):
+        super().__init__(title="Enter WiGLE Group Name")
+        self.bot = bot
+
+        self.group_name = discord.ui.TextInput(label="Group Name", placeholder="Enter the WiGLE group name here")
+        self.add_item(self.group_name)
+
+    async def on_submit(self, interaction: discord.Interaction):
+        group_name = self.group_name.value
+        await handlers.show_group_user_rank(interaction, group_name)
+
+
+@client.tree.command(name="wigle", description="Access WiGLE information.")
+async def wigle_command(interaction: discord.Interaction):
+    view = WigleCommandView(bot=client)
+    await interaction.response.send_message("Choose a WiGLE command!", view=view, ephemeral=False)
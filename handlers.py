@@ -0,0 +1,490 @@
+import asyncio
+import io
+import logging
+import math
+import time
+from array import array
+
+import discord
+
+from alliance import LazyPages, merge_members
+from deadline import Deadline
+from export import group_rows, rank_index_rows, standings_rows, write_export
+from fairshare import current_tenant
+from groupstats import cached_group_stats
+from views import (AllTime, GroupView, HelpView, MergedRankView, MonthRank, RegionRank, UserRankView,
+                   create_group_stats_embed, create_nearby_embed, create_neighbors_embed, create_user_stats_embed)
+from wigle_core import client, config
+
+# Interaction handlers shared by the slash commands and the /wigle button menu.
+
+
+def log_interaction(interaction: discord.Interaction, action: str):
+    server = interaction.guild
+    server_name = server.name if server else "Direct Message"
+    logging.info(f"{interaction.user} {action} on {server_name}")
+
+
+async def defer(interaction: discord.Interaction):
+    if not interaction.response.is_done():
+        await interaction.response.defer(ephemeral=False)
+
+
+def command_budget(command: str):
+    return config.get("command_budgets", {}).get(command, config.get("command_budget_seconds", 8))
+
+
+def not_found_message(response, index, name, default):
+    message = response.get("message", default)
+    if response.get("not_found"):
+        suggestions = [suggestion for suggestion in index.suggest(name) if suggestion != name]
+        if suggestions:
+            message += " Did you mean " + ", ".join(f"**{suggestion}**" for suggestion in suggestions) + "?"
+    return message
+
+
+async def respond(interaction: discord.Interaction, command: str, fetch, render):
+    # Serve from the cache with a single send_message when possible and only pay for
+    # defer + followup when an upstream fetch is needed. The path taken is recorded per command.
+    # Upstream calls share the command's deadline, so a slow WiGLE degrades to cached data or an
+    # error within the budget instead of leaving the interaction hanging. Only the upstream path
+    # counts against the caller's quota, and its requests queue fairly behind other guilds'.
+    started = time.perf_counter()
+    deadline = Deadline(command_budget(command))
+    path = "cached"
+    reply = None
+    tenant = current_tenant.set(client.scheduler.tenant(interaction.guild_id, interaction.user.id))
+    with client.tracer.trace(interaction.id, f"command.{command}", guild=interaction.guild_id,
+                             user=interaction.user.id) as trace:
+        try:
+            async with client.profiler.profile(command):
+                with client.tracer.span("cache"):
+                    response = await fetch(cached_only=True)
+                if response is None:
+                    retry_after = client.scheduler.admit(interaction.guild_id, interaction.user.id)
+                    if retry_after:
+                        path = "throttled"
+                        await send(interaction, content=f"You are sending requests too quickly, please try again in "
+                                                        f"{math.ceil(retry_after)}s.", ephemeral=True)
+                        return
+                    path = "deferred"
+                    with client.tracer.span("defer"):
+                        await defer(interaction)
+                    with client.tracer.span("fetch"):
+                        response = await fetch(deadline=deadline)
+
+                with client.tracer.span("render"):
+                    reply = render(response)
+                if response.get("stale_since"):
+                    note = f"⚠️ WiGLE is unavailable, showing data from <t:{int(response['stale_since'])}:R>."
+                    reply["content"] = f"{note}\n{reply['content']}" if reply.get("content") else note
+                with client.tracer.span("send"):
+                    await send(interaction, **reply)
+        except KeyError as e:
+            logging.error(f"A required key is missing in the response: {e}")
+            await send(interaction, content="Error: WiGLE returned incomplete data.")
+        except Exception as e:
+            logging.error(f"An error occurred: {e}")
+            await send(interaction, content="An error occurred while processing your request.")
+        finally:
+            if reply is not None and reply.get("file") is not None:
+                # discord.File leaves file objects it did not open to the caller
+                reply["file"].close()
+                reply["file"].fp.close()
+            trace.attributes["path"] = path
+            current_tenant.reset(tenant)
+            client.metrics.incr(f"command.{command}.{path}")
+            client.metrics.observe(f"command.{command}.{path}.seconds", time.perf_counter() - started)
+            if deadline.expired:
+                logging.warning(f"Command '{command}' overran its {deadline.budget}s budget")
+                client.metrics.incr(f"command.{command}.budget_overrun")
+
+
+async def send(interaction: discord.Interaction, view=None, **kwargs):
+    if view is not None:
+        kwargs["view"] = view
+
+    if interaction.response.is_done():
+        message = await interaction.followup.send(**kwargs)
+    else:
+        callback = await interaction.response.send_message(**kwargs)
+        message = getattr(callback, "resource", None)
+    client.outbound.note_activity(interaction.channel_id)
+
+    if view is not None and hasattr(view, "message"):
+        view.message = message
+
+
+async def show_user_stats(interaction: discord.Interaction, username: str):
+    log_interaction(interaction, f"searched for '{username}'")
+
+    def render(response):
+        if response.get("success"):
+            groups = client.memberships.groups_of(response["statistics"]["userName"])
+            return {"embed": create_user_stats_embed(response, int(time.time()), groups,
+                                                     config.get("user_groups_shown", 5))}
+        error_message = not_found_message(response, client.usernames, username, "Failed to fetch user stats.")
+        logging.warning(f"WiGLE user stats fetch error for {username}: {error_message}")
+        return {"content": error_message}
+
+    async def fetch(cached_only=False, deadline=None):
+        return await client.fetch_wigle_user_stats(username, cached_only=cached_only, deadline=deadline)
+
+    await respond(interaction, "user", fetch, render)
+
+
+async def show_user_neighbors(interaction: discord.Interaction, username: str):
+    log_interaction(interaction, f"looked up users ranked around '{username}'")
+
+    async def fetch(cached_only=False, deadline=None):
+        # The crawled index knows most ranks already; otherwise ask WiGLE for the user's rank
+        rank = client.rank_index.rank_of(username)
+        if rank is None:
+            stats = await client.fetch_wigle_user_stats(username, cached_only=cached_only, deadline=deadline)
+            if stats is None or not stats.get("success"):
+                return stats
+            rank = stats["statistics"].get("rank")
+            if rank is None:
+                return {"success": True, "rank": None, "rows": []}
+        return {"success": True, "rank": rank, "rows": client.rank_index.around(rank, config.get("neighbors_count", 5))}
+
+    def render(response):
+        if not response.get("success"):
+            return {"content": not_found_message(response, client.usernames, username, "Failed to fetch user stats.")}
+        if response["rank"] is None:
+            return {"content": f"'{username}' is unranked, so there is no one ranked around them."}
+        if not response["rows"]:
+            return {"content": f"Standings around rank {response['rank']:,} have not been loaded yet "
+                               f"(loaded down to rank {client.rank_index.depth:,}), please try again later."}
+        return {"embed": create_neighbors_embed(username, response["rank"], response["rows"])}
+
+    await respond(interaction, "neighbors", fetch, render)
+
+
+async def chart_response(title, series, cached_only):
+    if len(series) < 2:
+        return {"success": False, "message": "Not enough history to draw a chart yet, check back later."}
+    if cached_only:
+        png = client.charts.cached(title, series)
+        return {"success": True, "png": png} if png is not None else None
+    return {"success": True, "png": await client.charts.render(title, series)}
+
+
+def render_chart(response, index, name):
+    if not response.get("success"):
+        return {"content": not_found_message(response, index, name, "Failed to draw the chart.")}
+    embed = discord.Embed(title="WiGLE History", color=0x1E90FF)
+    embed.set_image(url="attachment://chart.png")
+    return {"embed": embed, "file": discord.File(io.BytesIO(response["png"]), filename="chart.png")}
+
+
+async def show_user_chart(interaction: discord.Interaction, username: str):
+    log_interaction(interaction, f"requested a history chart for '{username}'")
+    if not client.charts.available:
+        await send(interaction, content="Charts are not available on this bot.")
+        return
+
+    async def fetch(cached_only=False, deadline=None):
+        # Fetching the stats also records today's snapshot
+        stats = await client.fetch_wigle_user_stats(username, cached_only=cached_only, deadline=deadline)
+        if stats is None or not stats.get("success"):
+            return stats
+        await client.flush_history()
+        since = time.time() - config.get("chart_days", 90) * 86400
+        series = await asyncio.to_thread(client.history.user_series, username, since)
+        title = f"WiGLE history for '{stats['statistics']['userName']}'"
+        return await chart_response(title, series, cached_only)
+
+    await respond(interaction, "userchart", fetch, lambda response: render_chart(response, client.usernames, username))
+
+
+async def show_group_chart(interaction: discord.Interaction, group: str):
+    log_interaction(interaction, f"requested a history chart for group '{group}'")
+    if not client.charts.available:
+        await send(interaction, content="Charts are not available on this bot.")
+        return
+
+    async def fetch(cached_only=False, deadline=None):
+        groups = await client.fetch_wigle_group_rank(cached_only=cached_only, deadline=deadline)
+        if groups is None or not groups.get("success"):
+            return groups
+        if not any(entry["groupName"] == group for entry in groups["groups"]):
+            return {"success": False, "message": f"No group named '{group}' found.", "not_found": True}
+        await client.flush_history()
+        since = time.time() - config.get("chart_days", 90) * 86400
+        series = await asyncio.to_thread(client.history.group_series, group, since)
+        return await chart_response(f"WiGLE history for group '{group}'", series, cached_only)
+
+    await respond(interaction, "grouptrend", fetch, lambda response: render_chart(response, client.group_names, group))
+
+
+async def show_group_rank(interaction: discord.Interaction):
+    log_interaction(interaction, "accessed group rankings")
+
+    def render(response):
+        if response.get("success") is True:
+            view = GroupView(response["groups"])
+            return {"embed": view.get_embed(), "view": view}
+        return {"content": "Failed to fetch group ranks: " + response.get("message", "Unknown error")}
+
+    await respond(interaction, "grouprank", client.fetch_wigle_group_rank, render)
+
+
+async def show_group_user_rank(interaction: discord.Interaction, group: str):
+    log_interaction(interaction, f"checked user rankings for group '{group}'")
+
+    async def fetch(cached_only=False, deadline=None):
+        response = await client.fetch_wigle_id(group, cached_only=cached_only, deadline=deadline)
+        if response is None or not response.get("success"):
+            return response
+        return await client.fetch_group_members(response["groupId"], cached_only=cached_only, deadline=deadline)
+
+    def render(response):
+        if response.get("success") is False:
+            error_message = not_found_message(response, client.group_names, group, "Failed to fetch group ID.")
+            logging.warning(f"WiGLE group ID fetch error for {group}: {error_message}")
+            return {"content": error_message}
+        view = UserRankView(response.get("users", []), group)
+        return {"embed": view.embed, "view": view}
+
+    await respond(interaction, "userrank", fetch, render)
+
+
+async def show_merged_user_rank(interaction: discord.Interaction, groups):
+    log_interaction(interaction, f"checked combined user rankings for groups {', '.join(groups)}")
+    failed = None
+
+    async def fetch(cached_only=False, deadline=None):
+        nonlocal failed
+        # Resolved one after another: the first lookup loads the group list the others reuse
+        group_ids = []
+        for group in groups:
+            response = await client.fetch_wigle_id(group, cached_only=cached_only, deadline=deadline)
+            if response is None or not response.get("success"):
+                failed = group
+                return response
+            group_ids.append(response["groupId"])
+
+        members = await asyncio.gather(*(client.fetch_group_members(group_id, cached_only=cached_only,
+                                                                    deadline=deadline) for group_id in group_ids))
+        if any(response is None for response in members):
+            return None
+        for group, response in zip(groups, members):
+            if response.get("success") is False:
+                failed = group
+                return response
+        stale = [response["stale_since"] for response in members if response.get("stale_since")]
+        return {"success": True, "lists": [response.get("users", []) for response in members],
+                "stale_since": min(stale) if stale else None}
+
+    def render(response):
+        if response.get("success") is False:
+            return {"content": not_found_message(response, client.group_names, failed, "Failed to fetch group ID.")}
+        view = MergedRankView(LazyPages(merge_members(response["lists"])), groups)
+        return {"embed": view.embed, "view": view}
+
+    await respond(interaction, "userrank", fetch, render)
+
+
+async def show_group_stats(interaction: discord.Interaction, group: str):
+    log_interaction(interaction, f"viewed stats for group '{group}'")
+
+    async def fetch(cached_only=False, deadline=None):
+        response = await client.fetch_wigle_id(group, cached_only=cached_only, deadline=deadline)
+        if response is None or not response.get("success"):
+            return response
+        group_id = response["groupId"]
+        members = await client.fetch_group_members(group_id, cached_only=cached_only, deadline=deadline)
+        if members is None or members.get("success") is False:
+            return members
+        fetched_at = client.fetched_at(("groupMembers", group_id))
+        stats = cached_group_stats(group_id, members.get("users", []), fetched_at)
+        return {"success": True, "stats": stats, "stale_since": members.get("stale_since")}
+
+    def render(response):
+        if response.get("success") is False:
+            return {"content": not_found_message(response, client.group_names, group, "Failed to fetch group data.")}
+        return {"embed": create_group_stats_embed(group, response["stats"])}
+
+    await respond(interaction, "groupstats", fetch, render)
+
+
+async def show_nearby(interaction: discord.Interaction, lat: float, lon: float, radius: int):
+    log_interaction(interaction, f"searched for networks within {radius} m of {lat},{lon}")
+    # Planned once, so the cached pass and the search use the same cells
+    planned, cells = client.nearby.plan(lat, lon, radius)
+
+    async def fetch(cached_only=False, deadline=None):
+        response = await client.fetch_nearby(lat, lon, planned, cells, cached_only=cached_only, deadline=deadline)
+        if response is None and not cached_only:
+            return {"success": False, "message": "Failed to search for networks."}
+        return response
+
+    def render(response):
+        if not response.get("success"):
+            return {"content": response.get("message", "Failed to search for networks.")}
+        networks = response["results"][:config.get("nearby_count", 10)]
+        reply = {"embed": create_nearby_embed(lat, lon, response["radius"], networks, response["truncated"])}
+        if response["radius"] < radius:
+            reply["content"] = f"The radius was reduced to {response['radius']:,} m to keep the search area small."
+        return reply
+
+    await respond(interaction, "nearby", fetch, render)
+
+
+async def show_export(interaction: discord.Interaction, data: str, fmt: str, group: str = None):
+    log_interaction(interaction, f"exported {data} data{f' for {group}' if group else ''} as {fmt}")
+    name = group if data == "group" else data
+
+    async def fetch(cached_only=False, deadline=None):
+        # Exports always defer: writing a large file can outlast Discord's 3 second reply window
+        if cached_only:
+            return None
+
+        if data == "group":
+            response = await client.fetch_wigle_id(group, deadline=deadline)
+            if not response.get("success"):
+                return response
+            response = await client.fetch_group_members(response["groupId"], deadline=deadline)
+            if response.get("success") is False:
+                return response
+            rows = group_rows(response.get("users", []))
+        elif data == "alltime" and len(client.rank_index):
+            # The crawled standings go far deeper than the first page; export a snapshot of them
+            index = client.rank_index
+            response = {}
+            rows = rank_index_rows(array("q", index.ranks), list(index.names), array("q", index.discovered))
+        else:
+            response = await client.fetch_standings("discovered" if data == "alltime" else "monthcount", deadline=deadline)
+            if not response.get("success"):
+                return response
+            rows = standings_rows(response["results"])
+
+        spool, count, size = await asyncio.to_thread(write_export, rows, fmt, config.get("export_memory_bytes", 1048576))
+        return {"success": True, "file": spool, "count": count, "size": size,
+                "stale_since": response.get("stale_since")}
+
+    def render(response):
+        if response.get("success") is False:
+            return {"content": not_found_message(response, client.group_names, group, "Failed to fetch data to export.")}
+        limit = interaction.guild.filesize_limit if interaction.guild else 10 * 1024 * 1024
+        if response["size"] > limit:
+            response["file"].close()
+            return {"content": f"The export is {response['size'] / 1048576:.1f} MB, more than the "
+                               f"{limit / 1048576:.0f} MB upload limit here."}
+        filename = f"wigle-{name.strip('#').replace(' ', '_')}-{time.strftime('%Y%m%d')}.{fmt}.gz"
+        return {"content": f"Exported {response['count']:,} row{'' if response['count'] == 1 else 's'}.", "file": discord.File(response["file"], filename=filename)}
+
+    await respond(interaction, "export", fetch, render)
+
+
+async def show_alltime_rank(interaction: discord.Interaction):
+    log_interaction(interaction, "viewed all-time user rankings")
+
+    def render(response):
+        if response.get("success") is True:
+            view = AllTime(response["results"])
+            return {"embed": view.get_embed(), "view": view}
+        return {"content": "Failed to fetch user ranks: " + response.get("message", "Unknown error")}
+
+    await respond(interaction, "alltime", client.fetch_wigle_alltime_rank, render)
+
+
+async def show_month_rank(interaction: discord.Interaction):
+    log_interaction(interaction, "requested monthly user rankings")
+
+    def render(response):
+        if response.get("success") is True:
+            view = MonthRank(response["results"])
+            return {"embed": view.get_embed(), "view": view}
+        return {"content": "Failed to fetch monthly user rankings: " + response.get("message", "Unknown error")}
+
+    await respond(interaction, "monthly", client.fetch_wigle_month_rank, render)
+
+
+async def show_region_rank(interaction: discord.Interaction, country: str = None):
+    log_interaction(interaction, f"viewed {f'region rankings for {country}' if country else 'country rankings'}")
+
+    async def fetch(cached_only=False, deadline=None):
+        # Always answered from the tables the background refresh keeps, never from WiGLE directly
+        return client.region_boards.get(country) or {"success": False}
+
+    def render(response):
+        if response.get("success") is False:
+            if not client.region_boards.get():
+                return {"content": "Country rankings have not been loaded yet, please try again later."}
+            return {"content": f"Region rankings are only kept for "
+                               f"{', '.join(client.region_boards.tracked()) or 'no countries yet'}."}
+        title = f"WiGLE Region Rankings for {country.upper()}" if country else "WiGLE Country Rankings"
+        view = RegionRank(title, response["rows"], response["updated"])
+        return {"embed": view.get_embed(), "view": view}
+
+    await respond(interaction, "countries", fetch, render)
+
+
+async def show_help(interaction: discord.Interaction):
+    help_text = ("**Command List**\n"
+                 "`/user <username>` - Get stats for a WiGLE user; `show` picks a history chart or neighbors.\n"
+                 "`/grouprank` - Get WiGLE group rankings.\n"
+                 "`/userrank` - Get WiGLE user rankings for a group, or combined for up to five groups.\n"
+                 "`/groupstats <group>` - Get aggregate discovery stats for a group.\n"
+                 "`/nearby <lat> <lon> <radius>` - List the networks WiGLE knows closest to a point.\n"
+                 "`/export` - Download a group's members or the standings as CSV or NDJSON.\n"
+                 "`/grouptrend <group>` - Chart a group's rank and discoveries over time.\n"
+                 "`/alltime` - Get WiGLE All-Time user rankings.\n"
+                 "`/monthly` - Get WiGLE monthly user rankings.\n"
+                 "`/countries [country]` - Get WiGLE country rankings, or the regions of one country.\n"
+                 "`/subscribe` - Post a leaderboard in this channel daily or weekly.\n"
+                 "`/unsubscribe` - Stop a scheduled leaderboard.\n"
+                 "`/subscriptions` - List scheduled leaderboards in this server.\n"
+                 "`/watch <username>` - Get notified when a user's rank or monthly events change.\n"
+                 "`/unwatch <username>` - Stop watching a user.\n"
+                 "`/watchlist` - List the users you are watching.\n"
+                 "`/wigle` - Open the WiGLE button menu.\n"
+                 "`/help` - Shows this help message.\n\n")
+
+    color = 0x00FF00  # Bright Green
+
+    embed = discord.Embed(title="WiGLE Bot Help",
+                          description=help_text,
+                          color=color)
+    embed.set_footer(text="WiGLE Wardriving Bot by Kavitate & RocketGod")
+
+    image_url = "https://i.imgur.com/90kBgvJ.png"
+    embed.set_image(url=image_url)
+
+    view = HelpView()
+    await send(interaction, embed=embed, view=view)
+
+
+async def show_credits(interaction: discord.Interaction):
+    log_interaction(interaction, "viewed credits")
+
+    credits_text = (
+        "WiGLE Bot developed by Kavitate & RocketGod\n\n"
+        "This bot provides various functionalities to interact with the WiGLE API.\n"
+        "For more information, visit the official WiGLE website."
+    )
+
+    color = 0x00FF00  # Bright Green
+    embed = discord.Embed(title="Credits", description=credits_text, color=color)
+    embed.set_footer(text="WiGLE Wardriving Bot by Kavitate & RocketGod")
+    server_count = len(client.guilds)
+
+    ascii_art = (
+        "```"
+        "                       (         \n"
+        "    (  (        (      )\\ )      \n"
+        "    )\\))(   '(  )\\ )  (()/( (    \n"
+        "   ((_)()\\ ) )\\(()/(   /(_)))\\   \n"
+        "   _(())\\_)(|(_)/(_))_(_)) ((_)  \n"
+        "   \\ \\((_)/ /(_|_)) __| |  | __| \n"
+        "    \\ \\/\\/ / | | | (_ | |__| _|  \n"
+        "     \\_/\\_/  |_|  \\___|____|___| \n"
+        "   ```"
+        f"\nThis bot is used in {server_count} servers."
+    )
+    embed.add_field(name="", value=ascii_art, inline=False)
+
+    view = HelpView()
+    await send(interaction, embed=embed, view=view)
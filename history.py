@@ -0,0 +1,62 @@
+import logging
+import sqlite3
+import threading
+import time
+
+
+class HistoryStore:
+    # SQLite snapshots of user and group stats, taken whenever the bot fetches them from WiGLE
+    # (commands, digests and the watchlist poller) and at most once per `interval` seconds per
+    # user or group list. They are the data behind the rank history charts.
+    def __init__(self, path, interval=3600):
+        self.path = path
+        self.interval = interval
+        self.last_recorded = {}
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(path, check_same_thread=False)
+        with self.lock, self.db:
+            self.db.execute("PRAGMA journal_mode=WAL")
+            self.db.execute("CREATE TABLE IF NOT EXISTS user_snapshots (username TEXT NOT NULL, ts REAL NOT NULL, "
+                            "rank INTEGER, month_rank INTEGER, discovered INTEGER, event_month_count INTEGER)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS user_snapshots_username ON user_snapshots (username, ts)")
+            self.db.execute("CREATE TABLE IF NOT EXISTS group_snapshots (group_name TEXT NOT NULL, ts REAL NOT NULL, "
+                            "rank INTEGER, discovered INTEGER)")
+            self.db.execute("CREATE INDEX IF NOT EXISTS group_snapshots_name ON group_snapshots (group_name, ts)")
+
+    def due(self, key, now=None):
+        now = now or time.time()
+        if now - self.last_recorded.get(key, 0) < self.interval:
+            return False
+        self.last_recorded[key] = now
+        return True
+
+    def record_user(self, statistics, ts):
+        row = (statistics["userName"].lower(), ts, statistics.get("rank"), statistics.get("monthRank"),
+               statistics.get("discoveredWiFiGPS"), statistics.get("eventMonthCount"))
+        try:
+            with self.lock, self.db:
+                self.db.execute("INSERT INTO user_snapshots VALUES (?, ?, ?, ?, ?, ?)", row)
+        except sqlite3.Error as e:
+            logging.error(f"Failed to record history for {statistics['userName']}: {e}")
+
+    def record_groups(self, groups, ts):
+        rows = [(group["groupName"], ts, rank, group.get("discovered")) for rank, group in enumerate(groups, start=1)]
+        try:
+            with self.lock, self.db:
+                self.db.executemany("INSERT INTO group_snapshots VALUES (?, ?, ?, ?)", rows)
+        except sqlite3.Error as e:
+            logging.error(f"Failed to record group history: {e}")
+
+    def user_series(self, username, since=0):
+        with self.lock:
+            return self.db.execute("SELECT ts, rank, discovered FROM user_snapshots WHERE username = ? AND ts >= ? "
+                                   "ORDER BY ts", (username.lower(), since)).fetchall()
+
+    def group_series(self, group_name, since=0):
+        with self.lock:
+            return self.db.execute("SELECT ts, rank, discovered FROM group_snapshots WHERE group_name = ? AND ts >= ? "
+                                   "ORDER BY ts", (group_name, since)).fetchall()
+
+    def close(self):
+        with self.lock:
+            self.db.close()
@@ -0,0 +1,74 @@
+import asyncio
+import logging
+import time
+
+from ratelimit import RateLimiter
+
+
+class NoKeyAvailable(Exception):
+    pass
+
+
+class ApiKey:
+    def __init__(self, label, secret, rate, per):
+        self.label = label
+        self.secret = secret
+        self.limiter = RateLimiter(rate, per=per)
+        self.cooldown_until = 0.0
+        self.remaining = None
+
+    def available(self, now):
+        return now >= self.cooldown_until
+
+
+class KeyPool:
+    # Spreads authenticated requests over several WiGLE API keys, each with its own request rate.
+    # Each request takes the available key with the most budget left. A key answered with 429
+    # (or reporting no remaining quota) is rested for `cooldown` seconds or the server's
+    # Retry-After, one answered with 403 for `rejected_cooldown`, and requests move to the others.
+    # Keys are only ever named by label (key1, key2, ...) in logs and metrics.
+    def __init__(self, secrets, rate=60, per=60, cooldown=60, rejected_cooldown=900, metrics=None):
+        self.keys = [ApiKey(f"key{i}", secret, rate, per) for i, secret in enumerate(secrets, start=1)]
+        self.cooldown = cooldown
+        self.rejected_cooldown = rejected_cooldown
+        self.metrics = metrics
+
+    def __len__(self):
+        return len(self.keys)
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            available = [key for key in self.keys if key.available(now)]
+            if not available:
+                wait = min(key.cooldown_until for key in self.keys) - now
+                if wait > self.cooldown:
+                    raise NoKeyAvailable(f"All WiGLE API keys are resting for another {wait:.0f}s")
+                await asyncio.sleep(wait)
+                continue
+
+            for key in available:
+                key.limiter._refill()
+            key = max(available, key=lambda candidate: candidate.limiter.tokens)
+            await key.limiter.acquire()
+            if key.available(time.monotonic()):
+                return key
+
+    def record(self, key, status, headers=None):
+        headers = headers or {}
+        remaining = headers.get("X-RateLimit-Remaining")
+        if remaining is not None and remaining.isdigit():
+            key.remaining = int(remaining)
+
+        if status == 429 or key.remaining == 0:
+            retry_after = headers.get("Retry-After")
+            self.rest(key, float(retry_after) if retry_after and retry_after.isdigit() else self.cooldown, status)
+        elif status == 403:
+            self.rest(key, self.rejected_cooldown, status)
+
+    def rest(self, key, seconds, status):
+        key.cooldown_until = time.monotonic() + seconds
+        key.remaining = None
+        logging.warning(f"WiGLE API {key.label} got HTTP {status}, taking it out of rotation for {seconds:.0f}s")
+        if self.metrics is not None:
+            self.metrics.incr(f"wigle_key.{key.label}.{status}")
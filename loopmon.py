@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import sys
+import threading
+import time
+import traceback
+
+
+class LoopLagMonitor:
+    # A task wakes up every `interval` seconds and records how late the event loop ran it: that
+    # delay is time the loop spent on something else without yielding. A watchdog thread checks
+    # the task's heartbeat and, while the loop is stuck for longer than `threshold`, captures the
+    # loop thread's stack so the blocking code can be identified. Gateway heartbeats stall on
+    # the same loop, so sustained lag here is what makes Discord drop the connection.
+    def __init__(self, metrics, interval=0.5, threshold=0.25):
+        self.metrics = metrics
+        self.interval = interval
+        self.threshold = threshold
+        self.heartbeat = time.monotonic()
+        self.loop_thread_id = None
+        self.captured = False
+        self.task = None
+        self.stopped = threading.Event()
+        self.watchdog = None
+
+    def start(self):
+        if self.task is not None:
+            return
+        self.loop_thread_id = threading.get_ident()
+        self.heartbeat = time.monotonic()
+        self.stopped.clear()
+        self.task = asyncio.create_task(self.run())
+        self.watchdog = threading.Thread(target=self.watch, name="loop-watchdog", daemon=True)
+        self.watchdog.start()
+
+    async def stop(self):
+        self.stopped.set()
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def run(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - expected)
+            self.heartbeat = now
+            self.metrics.observe("loop.lag_seconds", lag)
+
+            if lag > self.threshold:
+                self.metrics.incr("loop.stalls")
+                logging.warning(f"Event loop was blocked for {lag:.3f}s")
+            self.captured = False
+
+    def watch(self):
+        # Logs from this thread, so a loop that never comes back still gets reported
+        while not self.stopped.wait(self.threshold / 2):
+            stalled = time.monotonic() - self.heartbeat - self.interval
+            if stalled > self.threshold and not self.captured:
+                frame = sys._current_frames().get(self.loop_thread_id)
+                if frame is not None:
+                    self.captured = True
+                    stack = "".join(traceback.format_stack(frame))
+                    logging.warning(f"Event loop blocked for more than {stalled:.3f}s, currently in:\n{stack}")
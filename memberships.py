@@ -0,0 +1,115 @@
+import asyncio
+import logging
+
+
+class MembershipIndex:
+    # Which groups each user is in and at what position, built from group member lists. Each
+    # group remembers the `discovered` total its list was crawled at, so a group whose total has
+    # not moved since does not need crawling again.
+    def __init__(self):
+        self.groups = {}
+        self.by_user = {}
+
+    def stale(self, group):
+        crawled = self.groups.get(group["groupId"])
+        return crawled is None or crawled["discovered"] != group["discovered"]
+
+    def update(self, group_id, name, discovered, usernames):
+        self.remove(group_id)
+        self.groups[group_id] = {"name": name, "discovered": discovered, "usernames": usernames}
+        for position, username in enumerate(usernames, start=1):
+            self.by_user.setdefault(username.lower(), {})[group_id] = position
+
+    def remove(self, group_id):
+        previous = self.groups.pop(group_id, None)
+        if previous is None:
+            return
+        for username in previous["usernames"]:
+            positions = self.by_user.get(username.lower())
+            if positions is not None:
+                positions.pop(group_id, None)
+                if not positions:
+                    del self.by_user[username.lower()]
+
+    def groups_of(self, username):
+        # [(group name, position, member count)], best position first
+        positions = self.by_user.get(username.lower(), {})
+        rows = [(self.groups[group_id]["name"], position, len(self.groups[group_id]["usernames"]))
+                for group_id, position in positions.items()]
+        rows.sort(key=lambda row: (row[1], row[0]))
+        return rows
+
+    def __len__(self):
+        return len(self.groups)
+
+
+class MembershipCrawler:
+    # Every `tick` seconds compares the group list with the index and crawls the member lists of
+    # new groups and of groups whose discovered total changed, at most `groups_per_tick` of them
+    # and `concurrency` at a time. Requests go through wigle_get and so share the API limiter and
+    # the groupMembers circuit breaker, but not the response cache, the stale fallback or the
+    # checkpoint: a full crawl would evict everything else from them, so only the index keeps
+    # the usernames.
+    def __init__(self, bot, index, tick=300, groups_per_tick=50, concurrency=2):
+        self.bot = bot
+        self.index = index
+        self.tick = tick
+        self.groups_per_tick = groups_per_tick
+        self.concurrency = concurrency
+        self.task = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def run(self):
+        while True:
+            try:
+                await self.crawl()
+            except Exception as e:
+                logging.error(f"Group membership crawl failed: {e}")
+            await asyncio.sleep(self.tick)
+
+    async def crawl(self):
+        response = await self.bot.fetch_wigle_group_rank()
+        if not response.get("success") or response.get("stale_since"):
+            return
+
+        groups = response["groups"]
+        current = {group["groupId"] for group in groups}
+        for group_id in [group_id for group_id in self.index.groups if group_id not in current]:
+            self.index.remove(group_id)
+
+        stale = [group for group in groups if self.index.stale(group)][:self.groups_per_tick]
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def crawl_group(group):
+            url = f"https://api.wigle.net/api/v2/group/groupMembers?groupid={group['groupId']}"
+            try:
+                async with semaphore:
+                    status, members = await self.bot.wigle_get("groupMembers", url, authenticated=False)
+            except Exception as e:
+                logging.warning(f"Membership crawl of group {group['groupName']} failed: {e}")
+                return False
+            if status != 200 or not members:
+                logging.warning(f"Membership crawl of group {group['groupName']} failed: {status}")
+                return False
+            # Members who left are not ranked, the same as in /userrank
+            usernames = [user["username"] for user in members.get("users", [])
+                         if user.get("username") and "L" not in user.get("status", "")]
+            self.index.update(group["groupId"], group["groupName"], group["discovered"], usernames)
+            return True
+
+        if stale:
+            crawled = sum(await asyncio.gather(*(crawl_group(group) for group in stale)))
+            logging.info(f"Crawled members of {crawled} of {len(stale)} changed groups, "
+                         f"{len(self.index)} groups indexed")
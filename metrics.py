@@ -0,0 +1,47 @@
+import json
+import logging
+import os
+from collections import Counter, defaultdict, deque
+
+
+class Metrics:
+    # In-process counters and timing samples. Timings keep the most recent `window` samples per
+    # name, which is enough for stable percentiles without unbounded growth.
+    def __init__(self, window=1024):
+        self.counters = Counter()
+        self.timings = defaultdict(lambda: deque(maxlen=window))
+
+    def incr(self, name, value=1):
+        self.counters[name] += value
+
+    def observe(self, name, value):
+        self.timings[name].append(value)
+
+    def percentile(self, name, pct):
+        samples = sorted(self.timings.get(name, ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, int(round(pct / 100 * (len(samples) - 1))))
+        return samples[index]
+
+    def summary(self):
+        timings = {}
+        for name, samples in self.timings.items():
+            if samples:
+                timings[name] = {
+                    "count": len(samples),
+                    "p50": self.percentile(name, 50),
+                    "p95": self.percentile(name, 95),
+                    "p99": self.percentile(name, 99),
+                    "max": max(samples),
+                }
+        return {"counters": dict(self.counters), "timings": timings}
+
+    def export(self, path=None):
+        summary = self.summary()
+        logging.info(f"Metrics: {json.dumps(summary, sort_keys=True)}")
+        if path:
+            tmp_path = f"{path}.tmp"
+            with open(tmp_path, "w") as metrics_file:
+                json.dump(summary, metrics_file, indent=2, sort_keys=True)
+            os.replace(tmp_path, path)
@@ -0,0 +1,159 @@
+import math
+
+from cache import TTLCache
+
+BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+EARTH_RADIUS_METERS = 6371000
+MIN_RADIUS_METERS = 10
+
+
+def encode(lat, lon, precision):
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    cell = []
+    bits, value, even = 0, 0, True
+    while len(cell) < precision:
+        span, coordinate = (lon_range, lon) if even else (lat_range, lat)
+        middle = (span[0] + span[1]) / 2
+        if coordinate >= middle:
+            value = value * 2 + 1
+            span[0] = middle
+        else:
+            value *= 2
+            span[1] = middle
+        even = not even
+        bits += 1
+        if bits == 5:
+            cell.append(BASE32[value])
+            bits, value = 0, 0
+    return "".join(cell)
+
+
+def cell_size(precision):
+    # Degrees of latitude and longitude covered by one cell
+    lon_bits = (5 * precision + 1) // 2
+    lat_bits = 5 * precision // 2
+    return 180 / 2 ** lat_bits, 360 / 2 ** lon_bits
+
+
+def bounds(cell):
+    lat_step, lon_step = cell_size(len(cell))
+    lat_range, lon_range = [-90.0, 90.0], [-180.0, 180.0]
+    even = True
+    for char in cell:
+        value = BASE32.index(char)
+        for shift in range(4, -1, -1):
+            span = lon_range if even else lat_range
+            middle = (span[0] + span[1]) / 2
+            if value >> shift & 1:
+                span[0] = middle
+            else:
+                span[1] = middle
+            even = not even
+    return lat_range[0], lon_range[0], lat_range[0] + lat_step, lon_range[0] + lon_step
+
+
+def covering(south, west, north, east, precision):
+    # Cells overlapping the box, walked on the cell grid from its south-west corner
+    lat_step, lon_step = cell_size(precision)
+    cells = []
+    lat = math.floor(south / lat_step) * lat_step + lat_step / 2
+    while lat - lat_step / 2 < north:
+        lon = math.floor(west / lon_step) * lon_step + lon_step / 2
+        while lon - lon_step / 2 < east:
+            cells.append(encode(min(lat, 90.0), (lon + 180) % 360 - 180, precision))
+            lon += lon_step
+        lat += lat_step
+    return cells
+
+
+def around(lat, lon, radius):
+    # Bounding box of a circle of `radius` meters
+    lat_delta = math.degrees(radius / EARTH_RADIUS_METERS)
+    lon_delta = min(lat_delta / max(math.cos(math.radians(lat)), 1e-6), 180.0)
+    return max(lat - lat_delta, -90.0), lon - lon_delta, min(lat + lat_delta, 90.0), lon + lon_delta
+
+
+def distance(lat1, lon1, lat2, lon2):
+    lat1, lon1, lat2, lon2 = map(math.radians, (lat1, lon1, lat2, lon2))
+    a = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
+
+
+class NearbyIndex:
+    # Network search results bucketed by geohash cell. A search covers whole cells, so every cell
+    # in it is known afterwards (including the empty ones) and a later query whose circle only
+    # touches known cells is answered locally. Each cell also remembers whether the search that
+    # filled it hit the page limit, in which case it may be missing networks. A query may touch
+    # at most `max_cells` cells, which keeps it well inside the cache and keeps one search from
+    # covering a huge area near the poles.
+    def __init__(self, precision=6, ttl=3600, maxsize=4096, max_cells=256):
+        self.precision = precision
+        self.max_cells = min(max_cells, maxsize // 4)
+        self.cells = TTLCache(maxsize=maxsize, ttl=ttl)
+
+    def cells_for(self, lat, lon, radius):
+        return covering(*around(lat, lon, radius), self.precision)
+
+    def count(self, south, west, north, east):
+        # How many cells covering() returns for the box, worked out from the grid without listing them
+        lat_step, lon_step = cell_size(self.precision)
+        rows = math.ceil(north / lat_step) - math.floor(south / lat_step)
+        columns = math.ceil(east / lon_step) - math.floor(west / lon_step)
+        return rows * columns
+
+    def plan(self, lat, lon, radius):
+        # Shrinks the radius until the query fits in `max_cells`; no cells if even the smallest does
+        # not. Cells are only listed once the count says they fit, so a huge box near a pole costs
+        # nothing to reject.
+        while True:
+            box = around(lat, lon, radius)
+            if self.count(*box) <= self.max_cells:
+                cells = covering(*box, self.precision)
+                if len(cells) <= self.max_cells:
+                    return radius, cells
+            if radius <= MIN_RADIUS_METERS:
+                return radius, None
+            radius = max(MIN_RADIUS_METERS, int(radius * 0.7))
+
+    def missing(self, cells):
+        return [cell for cell in cells if cell not in self.cells]
+
+    def search_boxes(self, cells):
+        # The smallest boxes made of whole cells that contain `cells`: one box, or one on each side
+        # of the antimeridian when the cells straddle it, instead of a box around the whole world
+        boxes = [bounds(cell) for cell in cells]
+        if max(box[3] for box in boxes) - min(box[1] for box in boxes) > 180:
+            sides = [[box for box in boxes if box[1] < 0], [box for box in boxes if box[1] >= 0]]
+        else:
+            sides = [boxes]
+        return [(min(box[0] for box in side), min(box[1] for box in side),
+                 max(box[2] for box in side), max(box[3] for box in side)) for side in sides]
+
+    def store(self, box, networks, truncated):
+        # Pulled in slightly so float error at the edges cannot claim a neighbouring cell
+        south, west, north, east = box
+        margin = cell_size(self.precision)[0] / 1000
+        filled = {cell: [] for cell in covering(south + margin, west + margin, north - margin, east - margin,
+                                                self.precision)}
+        for network in networks:
+            cell = encode(network["trilat"], network["trilong"], self.precision)
+            if cell in filled:
+                filled[cell].append(network)
+        for cell, cell_networks in filled.items():
+            self.cells.set(cell, (cell_networks, truncated))
+
+    def query(self, lat, lon, radius, cells):
+        results = []
+        truncated = False
+        for cell in cells:
+            entry = self.cells.get(cell)
+            if entry is None:
+                return None
+            cell_networks, cell_truncated = entry
+            truncated = truncated or cell_truncated
+            for network in cell_networks:
+                meters = distance(lat, lon, network["trilat"], network["trilong"])
+                if meters <= radius:
+                    results.append({**network, "distance": meters})
+        results.sort(key=lambda network: network["distance"])
+        return {"success": True, "results": results, "truncated": truncated}
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import time
+from collections import OrderedDict, deque
+
+import discord
+
+from cache import TTLCache
+from ratelimit import RateLimiter
+
+
+class ChannelQueue:
+    def __init__(self, rate, per):
+        self.high = deque()
+        self.low = OrderedDict()
+        self.limiter = RateLimiter(rate, per=per)
+        self.task = None
+
+
+class OutboundScheduler:
+    # Outbound Discord traffic that is not an interaction response, queued per channel against
+    # Discord's per-channel limits. Bot-initiated sends (digests, watch notifications) are high
+    # priority. Housekeeping edits, like disabling the buttons of an expired view, are low
+    # priority: they wait until the channel has been quiet for `quiet_period` seconds, pending
+    # edits of the same message are merged so only the latest is sent, and edits of messages
+    # that have since been deleted are dropped.
+    def __init__(self, rate=5, per=5.0, quiet_period=2.0, metrics=None):
+        self.rate = rate
+        self.per = per
+        self.quiet_period = quiet_period
+        self.metrics = metrics
+        self.channels = {}
+        self.activity = TTLCache(maxsize=10000, ttl=quiet_period)
+
+    def configure(self, rate=None, per=None, quiet_period=None, metrics=None):
+        self.rate = rate if rate is not None else self.rate
+        self.per = per if per is not None else self.per
+        self.quiet_period = quiet_period if quiet_period is not None else self.quiet_period
+        self.metrics = metrics if metrics is not None else self.metrics
+        self.activity.ttl = self.quiet_period
+
+    def queue_for(self, channel_id):
+        channel_queue = self.channels.get(channel_id)
+        if channel_queue is None:
+            channel_queue = self.channels[channel_id] = ChannelQueue(self.rate, self.per)
+        return channel_queue
+
+    def note_activity(self, channel_id):
+        # User-facing traffic in a channel pushes its pending housekeeping back
+        self.activity.set(channel_id, time.monotonic())
+
+    async def send(self, channel, **kwargs):
+        future = asyncio.get_running_loop().create_future()
+        channel_queue = self.queue_for(channel.id)
+        channel_queue.high.append((channel, kwargs, future))
+        self.wake(channel.id, channel_queue)
+        return await future
+
+    def edit(self, message, **kwargs):
+        if message is None:
+            return
+        channel = getattr(message, "channel", None)
+        channel_id = channel.id if channel is not None else 0
+        channel_queue = self.queue_for(channel_id)
+        if message.id in channel_queue.low:
+            self.count("outbound.edits_merged")
+            kwargs = {**channel_queue.low.pop(message.id)[1], **kwargs}
+        channel_queue.low[message.id] = (message, kwargs)
+        self.wake(channel_id, channel_queue)
+
+    def forget(self, channel_id, message_id):
+        channel_queue = self.channels.get(channel_id)
+        if channel_queue is not None and channel_queue.low.pop(message_id, None) is not None:
+            self.count("outbound.edits_dropped")
+
+    def wake(self, channel_id, channel_queue):
+        if channel_queue.task is None:
+            channel_queue.task = asyncio.create_task(self.drain(channel_id, channel_queue))
+
+    async def drain(self, channel_id, channel_queue):
+        try:
+            while channel_queue.high or channel_queue.low:
+                if channel_queue.high:
+                    channel, kwargs, future = channel_queue.high.popleft()
+                    await channel_queue.limiter.acquire()
+                    try:
+                        future.set_result(await channel.send(**kwargs))
+                    except Exception as e:
+                        future.set_exception(e)
+                    continue
+
+                quiet_for = time.monotonic() - self.activity.get(channel_id, 0.0)
+                if quiet_for < self.quiet_period:
+                    await asyncio.sleep(self.quiet_period - quiet_for)
+                    continue
+
+                message_id, (message, kwargs) = channel_queue.low.popitem(last=False)
+                await channel_queue.limiter.acquire()
+                try:
+                    await message.edit(**kwargs)
+                    self.count("outbound.edits_sent")
+                except discord.NotFound:
+                    self.count("outbound.edits_dropped")
+                except discord.HTTPException as e:
+                    logging.warning(f"Failed to edit message {message_id} in channel {channel_id}: {e}")
+        finally:
+            channel_queue.task = None
+            if not channel_queue.high and not channel_queue.low:
+                self.channels.pop(channel_id, None)
+
+    def count(self, name):
+        if self.metrics is not None:
+            self.metrics.incr(name)
+
+
+outbound = OutboundScheduler()
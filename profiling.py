@@ -0,0 +1,86 @@
+import asyncio
+import contextlib
+import cProfile
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+
+
+class StackSampler:
+    # Samples the stack of one thread from a background thread and counts collapsed stacks
+    # ("outer;inner;leaf"), the input format of flamegraph.pl and speedscope.
+    def __init__(self, thread_id, interval=0.005):
+        self.thread_id = thread_id
+        self.interval = interval
+        self.stacks = Counter()
+        self.stopped = threading.Event()
+        self.thread = threading.Thread(target=self.run, name="stack-sampler", daemon=True)
+
+    def start(self):
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+        self.thread.join()
+
+    def run(self):
+        while not self.stopped.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{os.path.basename(code.co_filename)}:{code.co_name}")
+                frame = frame.f_back
+            if stack:
+                self.stacks[";".join(reversed(stack))] += 1
+
+    def folded(self):
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+class CommandProfiler:
+    # Opt-in profiling of a fraction of command executions. Each sampled execution writes a
+    # cProfile dump (<command>-<time>.prof, readable with pstats or snakeviz) and sampled
+    # stacks (<command>-<time>.folded) for flame graphs. cProfile sees the whole event loop
+    # thread, so anything interleaved with the command shows up in its profile as well.
+    def __init__(self, directory="profiles", sample_rate=0.1, enabled=False, interval=0.005):
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.enabled = enabled
+        self.interval = interval
+        self.active = False
+
+    @contextlib.asynccontextmanager
+    async def profile(self, command):
+        # Only one cProfile profiler can be active per thread, so overlapping executions are skipped
+        if not self.enabled or self.active or random.random() >= self.sample_rate:
+            yield
+            return
+
+        self.active = True
+        profiler = cProfile.Profile()
+        sampler = StackSampler(threading.get_ident(), self.interval)
+        sampler.start()
+        profiler.enable()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            sampler.stop()
+            self.active = False
+            await asyncio.to_thread(self.write, command, profiler, sampler)
+
+    def write(self, command, profiler, sampler):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            base = os.path.join(self.directory, f"{command}-{time.strftime('%Y%m%d-%H%M%S')}-{random.randrange(1 << 16):04x}")
+            profiler.dump_stats(f"{base}.prof")
+            with open(f"{base}.folded", "w") as folded_file:
+                folded_file.write(sampler.folded())
+            logging.info(f"Wrote profile for '{command}' to {base}.prof and {base}.folded")
+        except Exception as e:
+            logging.error(f"Failed to write profile for '{command}': {e}")
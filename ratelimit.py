@@ -0,0 +1,35 @@
+import asyncio
+import time
+
+
+class RateLimiter:
+    # Token bucket: allows `rate` acquisitions every `per` seconds, with bursts of up to `burst`.
+    def __init__(self, rate, per=1.0, burst=None):
+        self.rate = rate
+        self.per = per
+        self.capacity = burst if burst is not None else rate
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate / self.per)
+        self.updated = now
+
+    async def acquire(self):
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) * self.per / self.rate)
+
+    def try_acquire(self, count=1):
+        # Non-blocking: takes `count` tokens and returns 0, or returns the seconds until they are available
+        self._refill()
+        if self.tokens >= count:
+            self.tokens -= count
+            return 0.0
+        return (count - self.tokens) * self.per / self.rate
@@ -0,0 +1,76 @@
+import asyncio
+import logging
+import time
+
+
+def ranked(entries, name_key):
+    # WiGLE's aggregates come unsorted and sometimes with blank names; keep (rank, name, count) rows
+    rows = sorted(((entry[name_key], entry.get("count") or 0) for entry in entries if entry.get(name_key)),
+                  key=lambda row: row[1], reverse=True)
+    return [(rank, name, count) for rank, (name, count) in enumerate(rows, start=1)]
+
+
+class RegionBoards:
+    # Country and region leaderboards, refreshed every `interval` seconds in the background and
+    # kept as ranked tables so /countries answers from memory without ever waiting on WiGLE.
+    # Regions are tracked for the `countries` largest countries, one request `spacing` seconds
+    # apart. A failed refresh keeps the previous table.
+    def __init__(self, bot, interval=21600, countries=10, spacing=5):
+        self.bot = bot
+        self.interval = interval
+        self.countries = countries
+        self.spacing = spacing
+        self.tables = {}
+        self.task = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def run(self):
+        # A checkpointed table that is still recent delays the first refresh
+        updated = min((table["updated"] for table in self.tables.values()), default=0)
+        await asyncio.sleep(max(0, updated + self.interval - time.time()))
+        while True:
+            try:
+                await self.refresh()
+            except Exception as e:
+                logging.error(f"Country and region leaderboard refresh failed: {e}")
+            await asyncio.sleep(self.interval)
+
+    async def refresh(self):
+        countries = await self.fetch("https://api.wigle.net/api/v2/stats/countries", "countries", "country")
+        if countries is None:
+            return
+        self.tables[""] = {"rows": countries, "updated": time.time()}
+
+        for _, country, _ in countries[:self.countries]:
+            await asyncio.sleep(self.spacing)
+            regions = await self.fetch(f"https://api.wigle.net/api/v2/stats/regions?country={country}",
+                                       "regions", "region")
+            if regions is not None:
+                self.tables[country] = {"rows": regions, "updated": time.time()}
+        logging.info(f"Refreshed country leaderboard and regions of {len(self.tables) - 1} countries")
+
+    async def fetch(self, req, field, name_key):
+        status, data = await self.bot.wigle_get("regions", req)
+        if status != 200 or not data or not data.get("success") or field not in data:
+            logging.warning(f"Leaderboard refresh from {req} failed: {status}")
+            return None
+        return ranked(data[field], name_key)
+
+    def get(self, country=None):
+        # The countries table is stored under ""
+        return self.tables.get((country or "").upper())
+
+    def tracked(self):
+        return sorted(country for country in self.tables if country)
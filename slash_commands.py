@@ -0,0 +1,221 @@
+import logging
+from typing import Literal
+
+import discord
+
+import handlers
+from wigle_core import client, config
+
+
+@client.tree.command(name="user", description="Get stats for a WiGLE user.")
+@discord.app_commands.describe(show="Show the user's stats, rank history chart or the users ranked around them")
+async def user(interaction: discord.Interaction, username: str, show: Literal["stats", "chart", "neighbors"] = "stats"):
+    logging.info(f"Command 'user' invoked for username: {username}")
+    if show == "chart":
+        await handlers.show_user_chart(interaction, username)
+    elif show == "neighbors":
+        await handlers.show_user_neighbors(interaction, username)
+    else:
+        await handlers.show_user_stats(interaction, username)
+
+
+@user.autocomplete("username")
+async def username_autocomplete(interaction: discord.Interaction, current: str):
+    return [discord.app_commands.Choice(name=name, value=name) for name in client.usernames.complete(current)]
+
+
+async def group_autocomplete(interaction: discord.Interaction, current: str):
+    return [discord.app_commands.Choice(name=name, value=name) for name in client.group_names.complete(current)]
+
+
+@client.tree.command(name="grouprank", description="Get WiGLE group rankings.")
+async def grouprank(interaction: discord.Interaction):
+    await handlers.show_group_rank(interaction)
+
+
+@client.tree.command(name="userrank", description="Get user ranks for group.")
+@discord.app_commands.describe(group2="Another group to combine into one ranking", group3="Another group to combine",
+                               group4="Another group to combine", group5="Another group to combine")
+@discord.app_commands.autocomplete(group=group_autocomplete, group2=group_autocomplete, group3=group_autocomplete,
+                                   group4=group_autocomplete, group5=group_autocomplete)
+async def userrank(interaction: discord.Interaction, group: str, group2: str = None, group3: str = None,
+                   group4: str = None, group5: str = None):
+    groups = list(dict.fromkeys(name for name in (group, group2, group3, group4, group5) if name))
+    logging.info(f"Command 'userrank' invoked for group names: {', '.join(groups)}")
+    if len(groups) > 1:
+        await handlers.show_merged_user_rank(interaction, groups)
+    else:
+        await handlers.show_group_user_rank(interaction, group)
+
+
+@client.tree.command(name="groupstats", description="Get aggregate discovery stats for a WiGLE group.")
+@discord.app_commands.autocomplete(group=group_autocomplete)
+async def groupstats(interaction: discord.Interaction, group: str):
+    logging.info(f"Command 'groupstats' invoked for group name: {group}")
+    await handlers.show_group_stats(interaction, group)
+
+
+@client.tree.command(name="grouptrend", description="Chart a WiGLE group's rank and discoveries over time.")
+@discord.app_commands.autocomplete(group=group_autocomplete)
+async def grouptrend(interaction: discord.Interaction, group: str):
+    logging.info(f"Command 'grouptrend' invoked for group name: {group}")
+    await handlers.show_group_chart(interaction, group)
+
+
+@client.tree.command(name="countries", description="Get WiGLE country rankings, or the region rankings of a country.")
+@discord.app_commands.describe(country="Two-letter country code, e.g. US, to rank its regions")
+async def countries(interaction: discord.Interaction, country: str = None):
+    logging.info(f"Command 'countries' invoked{f' for {country}' if country else ''}")
+    await handlers.show_region_rank(interaction, country)
+
+
+@countries.autocomplete("country")
+async def country_autocomplete(interaction: discord.Interaction, current: str):
+    return [discord.app_commands.Choice(name=code, value=code)
+            for code in client.region_boards.tracked() if code.startswith(current.upper())][:25]
+
+
+@client.tree.command(name="nearby", description="List the WiGLE networks closest to a point.")
+@discord.app_commands.describe(lat="Latitude in decimal degrees", lon="Longitude in decimal degrees",
+                               radius="Search radius in meters")
+async def nearby(interaction: discord.Interaction, lat: discord.app_commands.Range[float, -90, 90],
+                 lon: discord.app_commands.Range[float, -180, 180],
+                 radius: discord.app_commands.Range[int, 10, 2000] = 250):
+    logging.info(f"Command 'nearby' invoked for {lat},{lon} within {radius} m")
+    await handlers.show_nearby(interaction, lat, lon, radius)
+
+
+@client.tree.command(name="export", description="Download a group's members or the WiGLE standings as a file.")
+@discord.app_commands.describe(data="What to export", format="File format (gzip-compressed)",
+                               group="Group name (required for group)")
+@discord.app_commands.autocomplete(group=group_autocomplete)
+async def export(interaction: discord.Interaction, data: Literal["group", "alltime", "monthly"],
+                 format: Literal["csv", "ndjson"] = "csv", group: str = None):
+    logging.info(f"Command 'export' invoked for {data} ({format})")
+    if data == "group" and not group:
+        await interaction.response.send_message("A group name is required to export a group.", ephemeral=True)
+        return
+    await handlers.show_export(interaction, data, format, group)
+
+
+@client.tree.command(name="alltime", description="Get WiGLE All-Time User Rankings.")
+async def alltime(interaction: discord.Interaction):
+    await handlers.show_alltime_rank(interaction)
+
+
+@client.tree.command(name="monthly", description="Get WiGLE Monthly User Rankings.")
+async def monthly(interaction: discord.Interaction):
+    await handlers.show_month_rank(interaction)
+
+
+@client.tree.command(name="subscribe", description="Post a WiGLE leaderboard in this channel on a schedule.")
+@discord.app_commands.guild_only()
+@discord.app_commands.default_permissions(manage_guild=True)
+@discord.app_commands.describe(kind="Leaderboard to post", interval="How often to post it",
+                               group="Group name (required for userrank)", top="Number of entries to show")
+async def subscribe(interaction: discord.Interaction, kind: Literal["monthly", "alltime", "grouprank", "userrank"],
+                    interval: Literal["daily", "weekly"], group: str = None,
+                    top: discord.app_commands.Range[int, 1, 25] = 10):
+    logging.info(f"Command 'subscribe' invoked for {kind} ({interval}) in channel {interaction.channel_id}")
+
+    if kind == "userrank" and not group:
+        await interaction.response.send_message("A group name is required for userrank digests.", ephemeral=True)
+        return
+
+    sub = client.subscriptions.add(interaction.guild_id, interaction.channel_id, kind, interval,
+                                   group=group if kind == "userrank" else None, top=top)
+    await interaction.response.send_message(
+        f"Subscribed this channel to a {interval} {kind} digest (id `{sub['id']}`).", ephemeral=True
+    )
+
+
+@client.tree.command(name="unsubscribe", description="Stop a scheduled WiGLE leaderboard digest.")
+@discord.app_commands.guild_only()
+@discord.app_commands.default_permissions(manage_guild=True)
+async def unsubscribe(interaction: discord.Interaction, digest_id: str):
+    if client.subscriptions.remove(interaction.guild_id, digest_id):
+        await interaction.response.send_message(f"Digest `{digest_id}` removed.", ephemeral=True)
+    else:
+        await interaction.response.send_message(f"No digest `{digest_id}` in this server.", ephemeral=True)
+
+
+@client.tree.command(name="subscriptions", description="List scheduled WiGLE leaderboard digests in this server.")
+@discord.app_commands.guild_only()
+@discord.app_commands.default_permissions(manage_guild=True)
+async def list_subscriptions(interaction: discord.Interaction):
+    subs = client.subscriptions.for_guild(interaction.guild_id)
+    if not subs:
+        await interaction.response.send_message("No digests are scheduled in this server.", ephemeral=True)
+        return
+
+    lines = ""
+    for sub in subs:
+        target = f" '{sub['group']}'" if sub["group"] else ""
+        lines += f"`{sub['id']}` - {sub['interval']} {sub['kind']}{target} top {sub['top']} in <#{sub['channel_id']}>\n"
+    await interaction.response.send_message(lines, ephemeral=True)
+
+
+@client.tree.command(name="watch", description="Get notified when a WiGLE user's rank or monthly events change.")
+async def watch(interaction: discord.Interaction, username: str):
+    logging.info(f"Command 'watch' invoked for username: {username}")
+
+    if len(client.watchlist.for_user(interaction.user.id)) >= config.get("watch_limit_per_user", 25):
+        await interaction.response.send_message("You are already watching the maximum number of users.", ephemeral=True)
+        return
+
+    if client.watchlist.add(username, interaction.user.id, interaction.channel_id):
+        await interaction.response.send_message(
+            f"Watching **{username}**. Changes will be posted in this channel.", ephemeral=True
+        )
+    else:
+        await interaction.response.send_message(f"You are already watching **{username}**.", ephemeral=True)
+
+
+@client.tree.command(name="unwatch", description="Stop watching a WiGLE user.")
+async def unwatch(interaction: discord.Interaction, username: str):
+    if client.watchlist.remove(username, interaction.user.id):
+        await interaction.response.send_message(f"Stopped watching **{username}**.", ephemeral=True)
+    else:
+        await interaction.response.send_message(f"You are not watching **{username}**.", ephemeral=True)
+
+
+@client.tree.command(name="watchlist", description="List the WiGLE users you are watching.")
+async def list_watchlist(interaction: discord.Interaction):
+    entries = client.watchlist.for_user(interaction.user.id)
+    if not entries:
+        await interaction.response.send_message("You are not watching any users.", ephemeral=True)
+        return
+
+    lines = ""
+    for entry in entries:
+        rank = format(entry["rank"], ",") if entry["rank"] is not None else "pending"
+        lines += f"**{entry['username']}** - rank {rank}\n"
+    await interaction.response.send_message(lines, ephemeral=True)
+
+
+@client.tree.command(name="help", description="Displays help information for WiGLE Bot commands.")
+async def help_command(interaction: discord.Interaction):
+    await handlers.show_help(interaction)
+
+
+@client.tree.command(name="profile", description="Bot owner only: control command profiling.")
+@discord.app_commands.describe(action="Turn profiling on or off, or show its status",
+                               sample_rate="Fraction of command executions to profile (0-1)")
+async def profile(interaction: discord.Interaction, action: Literal["on", "off", "status"],
+                  sample_rate: discord.app_commands.Range[float, 0.0, 1.0] = None):
+    if not await client.is_owner(interaction.user):
+        await interaction.response.send_message("Only the bot owner can use this command.", ephemeral=True)
+        return
+
+    profiler = client.profiler
+    if action != "status":
+        profiler.enabled = action == "on"
+    if sample_rate is not None:
+        profiler.sample_rate = sample_rate
+    logging.info(f"{interaction.user} set profiling to enabled={profiler.enabled}, sample_rate={profiler.sample_rate}")
+
+    state = "on" if profiler.enabled else "off"
+    await interaction.response.send_message(
+        f"Profiling is {state}, sampling {profiler.sample_rate:.0%} of commands into `{profiler.directory}`.",
+        ephemeral=True,
+    )
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+from array import array
+from bisect import bisect_left, bisect_right
+
+
+class RankIndex:
+    # All-time standings as parallel columns sorted by rank, so the users around any rank are
+    # found by bisection. Pages from the crawler replace whatever the index held for their rank
+    # range, which keeps it consistent while the crawl is still working through later pages.
+    def __init__(self):
+        self.ranks = array("q")
+        self.discovered = array("q")
+        self.names = []
+        self.by_name = {}
+
+    def load(self, ranks, discovered, names):
+        # The columns may be memory-mapped from a checkpoint; they are copied on the first update
+        self.ranks = ranks
+        self.discovered = discovered
+        self.names = names
+        self.by_name = {name.lower(): rank for rank, name in zip(ranks, names)}
+
+    def update(self, rows):
+        # `rows` is one standings page as (rank, userName, discoveredWiFiGPS), sorted by rank
+        if not rows:
+            return
+        if not isinstance(self.ranks, array):
+            self.ranks, self.discovered = array("q", self.ranks), array("q", self.discovered)
+        lo = bisect_left(self.ranks, rows[0][0])
+        hi = bisect_right(self.ranks, rows[-1][0])
+        for rank, name in zip(self.ranks[lo:hi], self.names[lo:hi]):
+            if self.by_name.get(name.lower()) == rank:
+                del self.by_name[name.lower()]
+
+        self.ranks[lo:hi] = array("q", (rank for rank, _, _ in rows))
+        self.discovered[lo:hi] = array("q", (discovered for _, _, discovered in rows))
+        self.names[lo:hi] = [name for _, name, _ in rows]
+        for rank, name, _ in rows:
+            self.by_name[name.lower()] = rank
+
+    def rank_of(self, username):
+        return self.by_name.get(username.lower())
+
+    def around(self, rank, count=5):
+        # Returns up to `count` users ranked above and below `rank`, or [] if it was not crawled yet
+        position = bisect_left(self.ranks, rank)
+        if position == len(self.ranks) or self.ranks[position] != rank:
+            return []
+        start, end = max(0, position - count), position + count + 1
+        return list(zip(self.ranks[start:end], self.names[start:end], self.discovered[start:end]))
+
+    @property
+    def depth(self):
+        return self.ranks[-1] if self.ranks else 0
+
+    def __len__(self):
+        return len(self.ranks)
+
+
+class StandingsCrawler:
+    # Walks the all-time standings a few pages per tick, wrapping around to the first page after
+    # the last one (or after `max_rank`), and feeds every page into the rank index. Requests go
+    # through wigle_get and so share the bot's API limiter and standings circuit breaker.
+    def __init__(self, bot, index, tick=60, pages_per_tick=5, max_rank=0):
+        self.bot = bot
+        self.index = index
+        self.tick = tick
+        self.pages_per_tick = pages_per_tick
+        self.max_rank = max_rank
+        self.cursor = 0
+        self.task = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def run(self):
+        while True:
+            try:
+                for _ in range(self.pages_per_tick):
+                    if not await self.crawl_page():
+                        break
+            except Exception as e:
+                logging.error(f"Standings crawl at {self.cursor} failed: {e}")
+            await asyncio.sleep(self.tick)
+
+    async def crawl_page(self):
+        req = f"https://api.wigle.net/api/v2/stats/standings?sort=discovered&pagestart={self.cursor}"
+        status, data = await self.bot.wigle_get("standings", req)
+        if status != 200 or not data or not data.get("success"):
+            logging.warning(f"Standings crawl at {self.cursor} failed: {status}")
+            return False
+
+        results = data.get("results", [])
+        rows = [(result.get("rank") or self.cursor + i, result["userName"], result.get("discoveredWiFiGPS") or 0)
+                for i, result in enumerate(results, start=1)]
+        rows.sort()
+        self.index.update(rows)
+        self.bot.usernames.add_many(name for _, name, _ in rows)
+
+        self.cursor += len(results)
+        if not results or (self.max_rank and self.cursor >= self.max_rank):
+            logging.info(f"Standings crawl finished a pass, {len(self.index)} users indexed")
+            self.cursor = 0
+            return False
+        return True
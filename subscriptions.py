@@ -0,0 +1,196 @@
+import asyncio
+import json
+import logging
+import os
+import time
+import uuid
+
+import discord
+import inflect
+
+DIGEST_COLOR = 0x0000FF
+DIGEST_INTERVALS = {"daily": 86400, "weekly": 604800}
+DIGEST_KINDS = ("monthly", "alltime", "grouprank", "userrank")
+
+
+class SubscriptionStore:
+    def __init__(self, path):
+        self.path = path
+        self.subscriptions = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as subscriptions_file:
+                self.subscriptions = {sub["id"]: sub for sub in json.load(subscriptions_file)}
+        except FileNotFoundError:
+            self.subscriptions = {}
+        except (json.JSONDecodeError, KeyError, TypeError) as e:
+            logging.error(f"{self.path} is not a valid subscriptions file, starting empty: {e}")
+            self.subscriptions = {}
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as subscriptions_file:
+            json.dump(list(self.subscriptions.values()), subscriptions_file, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def add(self, guild_id, channel_id, kind, interval, group=None, top=10):
+        sub = {
+            "id": uuid.uuid4().hex[:8],
+            "guild_id": guild_id,
+            "channel_id": channel_id,
+            "kind": kind,
+            "interval": interval,
+            "group": group,
+            "top": top,
+            "next_run": time.time(),
+        }
+        self.subscriptions[sub["id"]] = sub
+        self.save()
+        return sub
+
+    def remove(self, guild_id, sub_id):
+        sub = self.subscriptions.get(sub_id)
+        if sub is None or sub["guild_id"] != guild_id:
+            return False
+        del self.subscriptions[sub_id]
+        self.save()
+        return True
+
+    def for_guild(self, guild_id):
+        return [sub for sub in self.subscriptions.values() if sub["guild_id"] == guild_id]
+
+    def due(self, now):
+        return [sub for sub in self.subscriptions.values() if sub["next_run"] <= now]
+
+
+class DigestScheduler:
+    # Posts subscribed leaderboards. Every tick the due subscriptions are grouped by the upstream
+    # resource they need, so each standings page, the group list and each groupMembers list is
+    # fetched at most once no matter how many channels subscribe to it.
+    def __init__(self, bot, store, send_limiter, tick=60):
+        self.bot = bot
+        self.store = store
+        self.send_limiter = send_limiter
+        self.tick = tick
+        self.task = None
+        self.p = inflect.engine()
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def run(self):
+        while True:
+            try:
+                await self.run_due()
+            except Exception as e:
+                logging.error(f"Digest scheduler tick failed: {e}")
+            await asyncio.sleep(self.tick)
+
+    async def run_due(self):
+        now = time.time()
+        due = self.store.due(now)
+        if not due:
+            return
+
+        resources = await self.fetch_resources(due)
+
+        for sub in due:
+            data = resources.get(self.resource_key(sub, resources))
+            await self.post(sub, data)
+            interval = DIGEST_INTERVALS[sub["interval"]]
+            sub["next_run"] = max(sub["next_run"] + interval, now + interval / 2)
+        self.store.save()
+
+    @staticmethod
+    def resource_key(sub, resources=None):
+        kind = sub["kind"]
+        if kind == "monthly":
+            return ("standings", "monthcount")
+        if kind == "alltime":
+            return ("standings", "discovered")
+        if kind == "grouprank":
+            return ("groups",)
+        group_ids = (resources or {}).get("group_ids", {})
+        return ("groupMembers", group_ids.get(sub["group"]))
+
+    async def fetch_resources(self, due):
+        kinds = {sub["kind"] for sub in due}
+        resources = {}
+
+        standings = {}
+        if "monthly" in kinds:
+            standings[("standings", "monthcount")] = self.bot.fetch_wigle_month_rank()
+        if "alltime" in kinds:
+            standings[("standings", "discovered")] = self.bot.fetch_wigle_alltime_rank()
+        if "grouprank" in kinds or "userrank" in kinds:
+            standings[("groups",)] = self.bot.fetch_wigle_group_rank()
+
+        results = await asyncio.gather(*standings.values())
+        resources.update(zip(standings.keys(), results))
+
+        # The group list is shared by /grouprank digests and by resolving every /userrank group
+        # name to its id, so it is fetched once for both.
+        groups = resources.get(("groups",), {})
+        resources["group_ids"] = {group["groupName"]: group["groupId"] for group in groups.get("groups", [])}
+
+        group_ids = {resources["group_ids"].get(sub["group"]) for sub in due if sub["kind"] == "userrank"}
+        group_ids.discard(None)
+        members = await asyncio.gather(*(self.bot.fetch_group_members(group_id) for group_id in group_ids))
+        for group_id, data in zip(group_ids, members):
+            resources[("groupMembers", group_id)] = data
+
+        logging.info(f"Digest tick: {len(due)} subscriptions served by {len(standings) + len(group_ids)} fetches")
+        return resources
+
+    async def post(self, sub, data):
+        channel = self.bot.get_channel(sub["channel_id"])
+        try:
+            if channel is None:
+                channel = await self.bot.fetch_channel(sub["channel_id"])
+            await self.send_limiter.acquire()
+            await self.bot.outbound.send(channel, **self.render(sub, data))
+        except (discord.NotFound, discord.Forbidden) as e:
+            logging.warning(f"Removing digest {sub['id']}, channel {sub['channel_id']} is unavailable: {e}")
+            self.store.subscriptions.pop(sub["id"], None)
+        except Exception as e:
+            logging.error(f"Failed to post digest {sub['id']} to channel {sub['channel_id']}: {e}")
+
+    def render(self, sub, data):
+        kind = sub["kind"]
+        if kind == "userrank" and data is None:
+            return {"content": f"Scheduled digest: could not load user rankings for '{sub['group']}'."}
+        if not data or data.get("success") is False:
+            message = (data or {}).get("message", "Unknown error")
+            return {"content": f"Scheduled digest: failed to fetch {kind} rankings: {message}"}
+
+        if kind == "monthly":
+            title, rows, name_key, value_key = "WiGLE Monthly User Rankings", data["results"], "userName", "eventMonthCount"
+        elif kind == "alltime":
+            title, rows, name_key, value_key = "WiGLE All-Time User Rankings", data["results"], "userName", "discoveredWiFiGPS"
+        elif kind == "grouprank":
+            title, rows, name_key, value_key = "WiGLE Group Rankings", data["groups"], "groupName", "discovered"
+        else:
+            rows = [user for user in data.get("users", []) if "L" not in user["status"]]
+            title, name_key, value_key = f"User Rankings for '{sub['group']}'", "username", "discovered"
+
+        rankings = ""
+        for i, row in enumerate(rows[:sub["top"]], start=1):
+            rankings += f"**{self.p.ordinal(i)}:** {row[name_key]} | **Total:** {row[value_key]:,}\n"
+
+        embed = discord.Embed(title=title, description=rankings, color=DIGEST_COLOR)
+        embed.set_footer(text=f"{sub['interval'].capitalize()} digest {sub['id']} - /unsubscribe to stop")
+        if data.get("stale_since"):
+            return {"content": f"⚠️ WiGLE is unavailable, showing data from <t:{int(data['stale_since'])}:R>.", "embed": embed}
+        return {"embed": embed}
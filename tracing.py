@@ -0,0 +1,134 @@
+import asyncio
+import contextlib
+import contextvars
+import json
+import logging
+import random
+import time
+
+current_trace = contextvars.ContextVar("current_trace", default=None)
+current_span = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "span_id", "parent_id", "start", "end", "attributes")
+
+    def __init__(self, name, parent_id, attributes):
+        self.name = name
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_id = parent_id
+        self.start = time.time()
+        self.end = None
+        self.attributes = attributes
+
+    def to_dict(self, trace_start):
+        return {"name": self.name, "span_id": self.span_id, "parent_id": self.parent_id,
+                "offset_ms": round((self.start - trace_start) * 1000, 3),
+                "duration_ms": round((self.end - self.start) * 1000, 3), "attributes": self.attributes}
+
+
+class Trace:
+    def __init__(self, trace_id):
+        self.trace_id = trace_id
+        self.spans = []
+        self.error = False
+
+
+class Tracer:
+    # Spans for one interaction (cache lookup, defer, each upstream attempt, parse, render, send)
+    # share a trace id derived from the interaction id. Sampling happens when the trace ends:
+    # traces that were slow or failed are always kept, the rest at `sample_rate`. Kept traces are
+    # appended to a JSONL file and/or posted to an OTLP/HTTP JSON endpoint. Without either,
+    # tracing is off and span() costs one context variable lookup.
+    def __init__(self, path=None, endpoint=None, slow_threshold=2.0, sample_rate=0.01, metrics=None):
+        self.path = path
+        self.endpoint = endpoint
+        self.slow_threshold = slow_threshold
+        self.sample_rate = sample_rate
+        self.metrics = metrics
+        self.session = None
+        self.exports = set()
+
+    @property
+    def enabled(self):
+        return bool(self.path or self.endpoint)
+
+    @contextlib.contextmanager
+    def trace(self, trace_id, name, **attributes):
+        if not self.enabled:
+            yield Span(name, None, attributes)
+            return
+
+        trace = Trace(f"{trace_id:032x}")
+        token = current_trace.set(trace)
+        try:
+            with self.span(name, **attributes) as root:
+                yield root
+        finally:
+            current_trace.reset(token)
+            self.finish(trace, root)
+
+    @contextlib.contextmanager
+    def span(self, name, **attributes):
+        trace = current_trace.get()
+        span = Span(name, current_span.get(), attributes)
+        if trace is None:
+            yield span
+            return
+
+        token = current_span.set(span.span_id)
+        try:
+            yield span
+        except BaseException as e:
+            span.attributes["error"] = type(e).__name__
+            trace.error = True
+            raise
+        finally:
+            span.end = time.time()
+            current_span.reset(token)
+            trace.spans.append(span)
+
+    def finish(self, trace, root):
+        duration = root.end - root.start
+        if not (trace.error or duration >= self.slow_threshold or random.random() < self.sample_rate):
+            return
+        if self.metrics is not None:
+            self.metrics.incr("traces.exported")
+        task = asyncio.create_task(self.export(trace, root))
+        self.exports.add(task)
+        task.add_done_callback(self.exports.discard)
+
+    async def export(self, trace, root):
+        try:
+            if self.path:
+                record = {"trace_id": trace.trace_id, "name": root.name, "start": root.start,
+                          "duration_ms": round((root.end - root.start) * 1000, 3), "error": trace.error,
+                          "spans": [span.to_dict(root.start) for span in trace.spans]}
+                await asyncio.to_thread(self.append, json.dumps(record))
+            if self.endpoint and self.session is not None:
+                async with self.session.post(self.endpoint, json=self.otlp(trace)) as response:
+                    if response.status >= 300:
+                        logging.warning(f"Trace collector at {self.endpoint} returned HTTP {response.status}")
+        except Exception as e:
+            logging.error(f"Failed to export trace {trace.trace_id}: {e}")
+
+    def append(self, line):
+        with open(self.path, "a") as trace_file:
+            trace_file.write(line + "\n")
+
+    @staticmethod
+    def otlp(trace):
+        spans = [{
+            "traceId": trace.trace_id,
+            "spanId": span.span_id,
+            "parentSpanId": span.parent_id or "",
+            "name": span.name,
+            "startTimeUnixNano": str(int(span.start * 1e9)),
+            "endTimeUnixNano": str(int(span.end * 1e9)),
+            "attributes": [{"key": key, "value": {"stringValue": str(value)}} for key, value in span.attributes.items()],
+            "status": {"code": 2 if "error" in span.attributes else 1},
+        } for span in trace.spans]
+        return {"resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": "wigle-discord-bot"}}]},
+            "scopeSpans": [{"scope": {"name": "wigle-discord-bot"}, "spans": spans}],
+        }]}
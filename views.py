@@ -0,0 +1,453 @@
+from datetime import datetime, timezone
+
+import discord
+import inflect
+from discord import ButtonStyle
+from discord.ui import Button, View
+
+from cache import TTLCache
+from outbound import outbound
+from watchlist import parse_event_date
+
+EMBED_COLOR_USER = 0xFF00FF  # Magenta
+EMBED_COLOR_GROUP_RANK = 0x0000FF  # Bright Red
+
+
+# Rendered user stats embeds keyed by the statistics payload. Popular profiles are looked up
+# repeatedly between refreshes, and an unchanged payload always renders to the same embed.
+user_stats_render_cache = TTLCache(maxsize=512, ttl=float("inf"))
+
+
+def format_number(number):
+    return "{:,}".format(number)
+
+
+def create_user_stats_embed(data, timestamp, groups=None, groups_shown=5):
+    try:
+        key = tuple(sorted(data["statistics"].items()))
+    except TypeError:
+        key = None
+
+    rendered = user_stats_render_cache.get(key) if key is not None else None
+    if rendered is None:
+        rendered = render_user_stats_embed(data).to_dict()
+        if key is not None:
+            user_stats_render_cache.set(key, rendered)
+
+    embed = discord.Embed.from_dict({**rendered, "fields": list(rendered["fields"])})
+
+    # Group ranks come from the membership index and change independently of the payload
+    if groups:
+        lines = [f"**{discord.utils.escape_markdown(name)}**: {format_number(position)} of {format_number(members)}"
+                 for name, position, members in groups[:groups_shown]]
+        if len(groups) > groups_shown:
+            lines.append(f"...and {len(groups) - groups_shown} more")
+        embed.add_field(name="👥 **Group Ranks**", value="\n".join(lines), inline=False)
+
+    # Image
+    image_url = data.get("imageBadgeUrl", "")
+    if image_url:
+        image_url += f"?nocache={timestamp}"
+        embed.set_image(url=f"https://api.wigle.net{image_url}")
+
+    return embed
+
+
+def render_user_stats_embed(data):
+    username = data["statistics"]["userName"]
+    rank = format_number(data["statistics"].get("rank", 0))
+    monthRank = format_number(data["statistics"].get("monthRank", 0))
+    prevRank = format_number(data["statistics"].get("prevRank", 0))
+    prevMonthRank = format_number(data["statistics"].get("prevMonthRank", 0))
+    eventMonthCount = format_number(data["statistics"].get("eventMonthCount", 0))
+    eventPrevMonthCount = format_number(data["statistics"].get("eventPrevMonthCount", 0))
+    discoveredWiFiGPS = format_number(data["statistics"].get("discoveredWiFiGPS", 0))
+    discoveredWiFiGPSPercent = data["statistics"].get("discoveredWiFiGPSPercent")
+    discoveredWiFi = format_number(data["statistics"].get("discoveredWiFi", 0))
+    discoveredCellGPS = format_number(data["statistics"].get("discoveredCellGPS", 0))
+    discoveredCell = format_number(data["statistics"].get("discoveredCell", 0))
+    discoveredBtGPS = format_number(data["statistics"].get("discoveredBtGPS", 0))
+    discoveredBt = format_number(data["statistics"].get("discoveredBt", 0))
+    totalWiFiLocations = format_number(data["statistics"].get("totalWiFiLocations", 0))
+
+    last_event = parse_event_date(data["statistics"].get("last"))
+    first_event = parse_event_date(data["statistics"].get("first"))
+    last_event_formatted = last_event.strftime("%B %d, %Y") if last_event else "Unknown"
+    first_event_formatted = first_event.strftime("%B %d, %Y") if first_event else "Unknown"
+
+    embed = discord.Embed(title=f"WiGLE User Stats for '{username}'", color=0x1E90FF)
+
+    # Stats
+    stats = (
+        f"**Username**: {username}\n"
+        f"**Monthly Rank**: {monthRank}\n"
+        f"**Last Month's Rank**: {prevMonthRank}\n"
+        f"**All-Time Rank**: {rank}\n"
+        f"**Previous All-Time Rank**: {prevRank}\n\n"
+    )
+    embed.add_field(name="📊 **Stats**", value=stats + "\n", inline=False)
+
+    # Event Information
+    event_info = (
+        f"**Events This Month**: {eventMonthCount}\n"
+        f"**Last Month's Events**: {eventPrevMonthCount}\n"
+        f"**First Ever Event**: {first_event_formatted}\n"
+        f"**Last Event**: {last_event_formatted}\n\n"
+    )
+    embed.add_field(name="📅 **Event Information**", value=event_info + "\n", inline=False)
+
+    # Discovery Statistics
+    discovery_stats = (
+        f"**Discovered WiFi GPS**: {discoveredWiFiGPS}\n"
+        f"**Discovered WiFi GPS Percent**: {discoveredWiFiGPSPercent}%\n"
+        f"**Discovered WiFi**: {discoveredWiFi}\n"
+        f"**Discovered Cell GPS**: {discoveredCellGPS}\n"
+        f"**Discovered Cell**: {discoveredCell}\n"
+        f"**Discovered BT GPS**: {discoveredBtGPS}\n"
+        f"**Discovered BT**: {discoveredBt}\n"
+        f"**Total WiFi Locations**: {totalWiFiLocations}"
+    )
+    embed.add_field(name="🔍 **Discovery Statistics**", value=discovery_stats, inline=False)
+
+    return embed
+
+
+def create_neighbors_embed(username, rank, rows):
+    rankings = ""
+    for row_rank, name, discovered in rows:
+        line = f"**{format_number(row_rank)}:** {name} | **Total:** {format_number(discovered)}"
+        rankings += f"➡️ {line}\n" if name.lower() == username.lower() else f"{line}\n"
+
+    embed = discord.Embed(title=f"WiGLE Users Ranked Around '{username}' (#{format_number(rank)})",
+                          description=rankings, color=0x1E90FF)
+    return embed
+
+
+def create_nearby_embed(lat, lon, radius, networks, truncated):
+    lines = ""
+    for network in networks:
+        ssid = network.get("ssid") or "(hidden)"
+        lines += (f"**{network['distance']:.0f} m:** {discord.utils.escape_markdown(ssid)} `{network.get('netid', '?')}` | "
+                  f"{network.get('encryption', 'unknown')} | Ch {network.get('channel') or '?'}\n")
+
+    embed = discord.Embed(title=f"WiGLE Networks Within {radius:,} m of {lat:.5f}, {lon:.5f}",
+                          description=lines or "No networks found.", color=0x1E90FF)
+    if truncated:
+        embed.set_footer(text="WiGLE returned only part of the networks in this area; closer ones may be missing.")
+    return embed
+
+
+def create_group_stats_embed(group, stats):
+    embed = discord.Embed(title=f"Group Stats for '{group}'", color=0x1E90FF)
+
+    members = (
+        f"**Members**: {format_number(stats['members'])}\n"
+        f"**Active**: {format_number(stats['active'])}\n"
+        f"**Left (L)**: {format_number(stats['left'])}\n"
+    )
+    embed.add_field(name="👥 **Members**", value=members, inline=False)
+
+    percentiles = " | ".join(f"p{pct}: {format_number(value)}" for pct, value in stats["percentiles"].items())
+    discovered = (
+        f"**Total**: {format_number(stats['total'])}\n"
+        f"**Mean**: {format_number(round(stats['mean']))}\n"
+        f"**Median**: {format_number(round(stats['median']))}\n"
+        f"**Percentiles**: {percentiles}\n"
+        f"**Top 10 Share**: {stats['top_share']:.1%}\n"
+    )
+    embed.add_field(name="📡 **Discovered**", value=discovered, inline=False)
+
+    return embed
+
+
+class UserRankView(discord.ui.View):
+    def __init__(self, users, group):
+        super().__init__(timeout=10)
+        self.users = users
+        self.group = group
+        self.page = 0
+        self.message = None
+        self.update_button()
+
+    def has_next(self):
+        return self.page < len(self.users) // 10
+
+    def update_button(self):
+        if len(self.users) == 0 or self.page >= len(self.users) // 10:
+            self.previous_page.disabled = False
+            self.next_page.disabled = True
+        else:
+            self.previous_page.disabled = self.page == 0
+            self.next_page.disabled = False
+
+        p = inflect.engine()
+        filtered_users = [user for user in self.users if "L" not in user["status"]]
+        start = self.page * 10
+        end = start + 10
+        users_on_page = filtered_users[start:end]
+
+        rankings = ""
+        for i, user in enumerate(users_on_page, start + 1):
+            username = user["username"]
+            discovered = format_number(user["discovered"])
+            rank = p.ordinal(i)
+            rankings += f"**{rank}:** {username} | **Total:** {discovered}\n"
+
+        self.embed = discord.Embed(title=f"User Rankings for '{self.group}'", color=0x1E90FF, description=rankings)
+
+    @discord.ui.button(label="< Back", style=discord.ButtonStyle.blurple)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.page > 0:
+            self.page -= 1
+            self.update_button()
+            await interaction.response.edit_message(embed=self.embed, view=self)
+
+    @discord.ui.button(label="Reset", style=discord.ButtonStyle.red)
+    async def reset_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = 0
+        self.update_button()
+        await interaction.response.edit_message(embed=self.embed, view=self)
+
+    @discord.ui.button(label="Next >", style=discord.ButtonStyle.blurple)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        if self.has_next():
+            self.page += 1
+            self.update_button()
+            await interaction.response.edit_message(embed=self.embed, view=self)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.message is None:
+            self.message = interaction.message
+        return True
+
+    async def on_timeout(self):
+        if self.message is not None:
+            for item in self.children:
+                item.disabled = True
+            outbound.edit(self.message, view=self)
+
+
+class MergedRankView(UserRankView):
+    # UserRankView over a LazyPages of the merged ranking, so only viewed pages are built
+    def __init__(self, pages, groups):
+        self.pages = pages
+        super().__init__(pages, groups)
+
+    def has_next(self):
+        return self.pages.has_next(self.page)
+
+    def update_button(self):
+        self.previous_page.disabled = self.page == 0
+        self.next_page.disabled = not self.has_next()
+
+        p = inflect.engine()
+        rankings = ""
+        for i, user in enumerate(self.pages.page(self.page), self.page * self.pages.size + 1):
+            rankings += f"**{p.ordinal(i)}:** {user['username']} | **Total:** {format_number(user['discovered'])}\n"
+
+        title = ", ".join(f"'{group}'" for group in self.group)
+        self.embed = discord.Embed(title=f"Combined User Rankings for {title}"[:256], color=0x1E90FF,
+                                   description=rankings or "No active members.")
+
+
+class GroupView(View):
+    def __init__(self, groups):
+        super().__init__(timeout=10)
+        self.groups = groups
+        self.page = 0
+        self.message = None
+        self.p = inflect.engine()
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.previous.disabled = self.page == 0
+        self.next.disabled = self.page == len(self.groups) // 10 - 1
+
+    @discord.ui.button(label="< Back", style=discord.ButtonStyle.blurple)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
+    @discord.ui.button(label="Reset", style=discord.ButtonStyle.danger)
+    async def reset(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = 0
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
+    @discord.ui.button(label="Next >", style=discord.ButtonStyle.blurple)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
+    def get_embed(self):
+        start = self.page * 10
+        end = start + 10
+        group_slice = self.groups[start:end]
+        rankings = ""
+        for i, group in enumerate(group_slice, start=start + 1):
+            groupName = group["groupName"]
+            discovered = format_number(group["discovered"])
+            rank = self.p.ordinal(i)
+            rankings += f"**{rank}:** {groupName} | **Total:** {discovered}\n"
+
+        embed = discord.Embed(title="WiGLE Group Rankings", description=rankings, color=EMBED_COLOR_GROUP_RANK)
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.message is None:
+            self.message = interaction.message
+        return True
+
+    async def on_timeout(self):
+        if self.message is not None:
+            for item in self.children:
+                item.disabled = True
+            outbound.edit(self.message, view=self)
+
+
+class AllTime(View):
+    # Subclasses page through other rankings by overriding `title` and format_row()
+    title = "WiGLE All-Time User Rankings"
+
+    def __init__(self, results):
+        super().__init__(timeout=10)
+        self.results = results
+        self.page = 0
+        self.message = None
+        self.p = inflect.engine()
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.previous.disabled = self.page == 0
+        self.next.disabled = self.page >= (len(self.results) - 1) // 10
+
+    @discord.ui.button(label="< Back", style=discord.ButtonStyle.blurple)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
+    @discord.ui.button(label="Reset", style=discord.ButtonStyle.danger)
+    async def reset(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = 0
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
+    @discord.ui.button(label="Next >", style=discord.ButtonStyle.blurple)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
+    def get_embed(self):
+        start = self.page * 10
+        end = start + 10
+        user_slice = self.results[start:end]
+        rankings = ""
+        for i, results in enumerate(user_slice, start=start + 1):
+            rankings += self.format_row(i, results) + "\n"
+        embed = discord.Embed(title=self.title, description=rankings, color=EMBED_COLOR_GROUP_RANK)
+        return embed
+
+    def format_row(self, position, results):
+        userName = results["userName"]
+        discoveredWiFiGPS = format_number(results["discoveredWiFiGPS"])
+        return f"**{self.p.ordinal(position)}:** {userName} | **Total:** {discoveredWiFiGPS}"
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.message is None:
+            self.message = interaction.message
+        return True
+
+    async def on_timeout(self):
+        if self.message is not None:
+            for item in self.children:
+                item.disabled = True
+            outbound.edit(self.message, view=self)
+
+
+class MonthRank(View):
+    def __init__(self, results):
+        super().__init__(timeout=10)
+        self.results = results
+        self.page = 0
+        self.message = None
+        self.p = inflect.engine()
+        self.update_buttons()
+
+    def update_buttons(self):
+        self.previous.disabled = self.page == 0
+        self.next.disabled = self.page == len(self.results) // 10 - 1
+
+    @discord.ui.button(label="< Back", style=discord.ButtonStyle.blurple)
+    async def previous(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page -= 1
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
+    @discord.ui.button(label="Reset", style=discord.ButtonStyle.danger)
+    async def reset(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page = 0
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
+    @discord.ui.button(label="Next >", style=discord.ButtonStyle.blurple)
+    async def next(self, interaction: discord.Interaction, button: discord.ui.Button):
+        self.page += 1
+        self.update_buttons()
+        await interaction.response.edit_message(embed=self.get_embed(), view=self)
+
+    def get_embed(self):
+        start = self.page * 10
+        end = start + 10
+        user_slice = self.results[start:end]
+        rankings = ""
+        for i, results in enumerate(user_slice, start=start + 1):
+            userName = results["userName"]
+            eventMonthCount = format_number(results["eventMonthCount"])
+            rank = self.p.ordinal(i)
+            rankings += f"**{rank}:** {userName} | **Total:** {eventMonthCount}\n"
+        embed = discord.Embed(title="WiGLE Monthly User Rankings", description=rankings, color=EMBED_COLOR_GROUP_RANK)
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        if self.message is None:
+            self.message = interaction.message
+        return True
+
+    async def on_timeout(self):
+        if self.message is not None:
+            for item in self.children:
+                item.disabled = True
+            outbound.edit(self.message, view=self)
+
+
+class RegionRank(AllTime):
+    # Country and region tables are (rank, name, count) rows that carry their own rank
+    def __init__(self, title, rows, updated):
+        self.title = title
+        self.updated = updated
+        super().__init__(rows)
+
+    def format_row(self, position, row):
+        rank, name, count = row
+        return f"**{self.p.ordinal(rank)}:** {name} | **Total:** {format_number(count)}"
+
+    def get_embed(self):
+        embed = super().get_embed()
+        embed.timestamp = datetime.fromtimestamp(self.updated, timezone.utc)
+        embed.set_footer(text="Updated")
+        return embed
+
+
+class HelpView(View):
+    def __init__(self):
+        super().__init__(timeout=None)
+
+        # Create the buttons
+        self.add_item(Button(label="Kavitate", style=ButtonStyle.link, url="https://github.com/Kavitate"))
+        self.add_item(Button(label="WiGLE", style=ButtonStyle.link, url="https://wigle.net"))
+        self.add_item(Button(label="RocketGod", style=ButtonStyle.link, url="https://github.com/RocketGod-git"))
+
@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime
+
+import discord
+
+# Poll interval by days since the user's last WiGLE event: active users are checked often,
+# dormant ones rarely, so a large watchlist costs roughly its active members in API calls.
+ACTIVITY_INTERVALS = ((1, 15 * 60), (7, 60 * 60), (30, 6 * 60 * 60))
+IDLE_INTERVAL = 24 * 60 * 60
+POLL_JITTER = 0.2
+
+
+def parse_event_date(value):
+    # WiGLE reports event times as "YYYYMMDD-HHMMSS"; only the date part is used.
+    date_str = (value or "").split("-")[0]
+    if not date_str:
+        return None
+    try:
+        return datetime.strptime(date_str, "%Y%m%d")
+    except ValueError:
+        logging.warning(f"Date format error for event date: {value}")
+        return None
+
+
+def format_rank(rank):
+    # A user who drops off the standings, or was first seen without a rank, has none
+    return f"{rank:,}" if rank is not None else "unranked"
+
+
+def poll_interval(last_event, now=None):
+    if last_event is None:
+        return IDLE_INTERVAL
+    now = now or datetime.now()
+    days = (now - last_event).days
+    for max_days, interval in ACTIVITY_INTERVALS:
+        if days <= max_days:
+            return interval
+    return IDLE_INTERVAL
+
+
+class WatchStore:
+    def __init__(self, path):
+        self.path = path
+        self.watched = {}
+        self.load()
+
+    def load(self):
+        try:
+            with open(self.path, "r") as watchlist_file:
+                self.watched = json.load(watchlist_file)
+        except FileNotFoundError:
+            self.watched = {}
+        except json.JSONDecodeError as e:
+            logging.error(f"{self.path} is not a valid watchlist file, starting empty: {e}")
+            self.watched = {}
+
+    def save(self):
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as watchlist_file:
+            json.dump(self.watched, watchlist_file, indent=2)
+        os.replace(tmp_path, self.path)
+
+    def add(self, username, user_id, channel_id):
+        entry = self.watched.setdefault(username.lower(), {
+            "username": username,
+            "watchers": [],
+            "rank": None,
+            "eventMonthCount": None,
+            "last": None,
+            "next_poll": time.time(),
+        })
+        if any(watcher["user_id"] == user_id for watcher in entry["watchers"]):
+            return False
+        entry["watchers"].append({"user_id": user_id, "channel_id": channel_id})
+        self.save()
+        return True
+
+    def remove(self, username, user_id):
+        entry = self.watched.get(username.lower())
+        if entry is None:
+            return False
+        watchers = [watcher for watcher in entry["watchers"] if watcher["user_id"] != user_id]
+        if len(watchers) == len(entry["watchers"]):
+            return False
+        if watchers:
+            entry["watchers"] = watchers
+        else:
+            del self.watched[username.lower()]
+        self.save()
+        return True
+
+    def for_user(self, user_id):
+        return [entry for entry in self.watched.values()
+                if any(watcher["user_id"] == user_id for watcher in entry["watchers"])]
+
+    def due(self, now, limit):
+        due = [entry for entry in self.watched.values() if entry["next_poll"] <= now]
+        due.sort(key=lambda entry: entry["next_poll"])
+        return due[:limit]
+
+
+class WatchPoller:
+    # Polls stats/user for watched usernames. Each tick takes at most `batch_size` of the most
+    # overdue users, staggers their requests across the tick and sends them through the bot's
+    # shared API limiter, so the watchlist can never use more than its share of the key.
+    def __init__(self, bot, store, send_limiter, tick=60, batch_size=20):
+        self.bot = bot
+        self.store = store
+        self.send_limiter = send_limiter
+        self.tick = tick
+        self.batch_size = batch_size
+        self.task = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.create_task(self.run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+            self.task = None
+
+    async def run(self):
+        while True:
+            try:
+                await self.poll_due()
+            except Exception as e:
+                logging.error(f"Watchlist poll failed: {e}")
+            await asyncio.sleep(self.tick)
+
+    async def poll_due(self):
+        due = self.store.due(time.time(), self.batch_size)
+        if not due:
+            return
+
+        await asyncio.gather(*(self.poll(entry, random.uniform(0, self.tick / 2)) for entry in due))
+        for username in [username for username, entry in self.store.watched.items() if not entry["watchers"]]:
+            del self.store.watched[username]
+        self.store.save()
+
+    async def poll(self, entry, delay):
+        await asyncio.sleep(delay)
+        response = await self.bot.fetch_wigle_user_stats(entry["username"])
+
+        if not response.get("success"):
+            logging.warning(f"Watchlist poll for {entry['username']} failed: {response.get('message')}")
+            self.schedule(entry, IDLE_INTERVAL if response.get("message") == "User not found." else self.tick * 5)
+            return
+
+        if response.get("stale_since"):
+            # WiGLE is down and this is the last known snapshot, nothing new to compare
+            self.schedule(entry, self.tick * 5)
+            return
+
+        statistics = response["statistics"]
+        rank = response.get("rank", statistics.get("rank"))
+        event_month_count = statistics.get("eventMonthCount")
+        # Entries saved before "polled" existed count as polled once they hold a value
+        polled = entry.get("polled", entry["rank"] is not None or entry["eventMonthCount"] is not None)
+        changes = []
+        if polled and rank != entry["rank"]:
+            changes.append(f"rank {format_rank(entry['rank'])} → {format_rank(rank)}")
+        if polled and event_month_count != entry["eventMonthCount"]:
+            changes.append(f"events this month {entry['eventMonthCount'] or 0:,} → {event_month_count or 0:,}")
+
+        entry["polled"] = True
+        entry["rank"] = rank
+        entry["eventMonthCount"] = event_month_count
+        entry["last"] = statistics.get("last")
+        self.schedule(entry, poll_interval(parse_event_date(entry["last"])))
+
+        if changes:
+            await self.notify(entry, ", ".join(changes))
+
+    def schedule(self, entry, interval):
+        entry["next_poll"] = time.time() + interval * random.uniform(1 - POLL_JITTER, 1 + POLL_JITTER)
+
+    async def notify(self, entry, summary):
+        by_channel = {}
+        for watcher in entry["watchers"]:
+            by_channel.setdefault(watcher["channel_id"], []).append(watcher["user_id"])
+
+        for channel_id, user_ids in by_channel.items():
+            mentions = " ".join(f"<@{user_id}>" for user_id in user_ids)
+            try:
+                channel = self.bot.get_channel(channel_id) or await self.bot.fetch_channel(channel_id)
+                await self.send_limiter.acquire()
+                await self.bot.outbound.send(channel, content=f"{mentions} **{entry['username']}**: {summary}")
+            except (discord.NotFound, discord.Forbidden) as e:
+                logging.warning(f"Dropping watchers of {entry['username']} in channel {channel_id}: {e}")
+                entry["watchers"] = [watcher for watcher in entry["watchers"] if watcher["channel_id"] != channel_id]
+            except Exception as e:
+                logging.error(f"Failed to notify channel {channel_id} about {entry['username']}: {e}")
@@ -0,0 +1,565 @@
+import asyncio
+import json
+import logging
+import queue
+import random
+import signal
+import time
+from logging.handlers import QueueHandler, QueueListener
+
+import aiohttp
+import discord
+
+from breaker import CircuitBreaker
+from cache import TTLCache
+from charts import ChartRenderer
+from checkpoint import Checkpoint
+from deadline import DeadlineExceeded
+from fairshare import FairScheduler, current_tenant
+from fuzzy import TrigramIndex
+from gateway import gateway_options
+from keypool import KeyPool
+from history import HistoryStore
+from loopmon import LoopLagMonitor
+from memberships import MembershipCrawler, MembershipIndex
+from metrics import Metrics
+from nearby import NearbyIndex
+from outbound import outbound
+from profiling import CommandProfiler
+from ratelimit import RateLimiter
+from regions import RegionBoards
+from standings import RankIndex, StandingsCrawler
+from subscriptions import DigestScheduler, SubscriptionStore
+from tracing import Tracer
+from watchlist import WatchPoller, WatchStore
+
+# Log records are handed to a listener thread so writing them never blocks the event loop
+log_queue = queue.SimpleQueue()
+logging.basicConfig(level=logging.DEBUG, handlers=[QueueHandler(log_queue)])
+logging.getLogger('discord.gateway').setLevel(logging.WARNING)
+log_listener = QueueListener(log_queue, logging.StreamHandler())
+log_listener.start()
+
+# Seconds a successful upstream response is reused, per kind of resource
+CACHE_TTLS = {"user": 120, "groups": 300, "standings": 300, "groupMembers": 300, "search": 3600, "regions": 21600}
+UNAVAILABLE_MESSAGE = "WiGLE is not responding right now, please try again later."
+RETRY_BACKOFF_SECONDS = 0.5
+MIN_ATTEMPT_SECONDS = 1.0
+# A request given at least this long that still times out counts against WiGLE's health, even
+# when the command's deadline is what cut it short
+HEALTH_PROBE_SECONDS = 3.0
+
+
+def load_config():
+    try:
+        with open("config.json", "r") as config_file:
+            return json.load(config_file)
+    except FileNotFoundError:
+        logging.critical("The config.json file was not found.")
+        raise
+    except json.JSONDecodeError:
+        logging.critical("config.json is not a valid JSON file.")
+        raise
+    except Exception as e:
+        logging.critical(f"An unexpected error occurred while loading config.json: {e}")
+        raise
+
+
+config = load_config()
+
+discord_bot_token = config["discord_bot_token"]
+# A list of keys in "wigle_api_keys" spreads requests over all of them
+wigle_api_keys = config.get("wigle_api_keys") or [config["wigle_api_key"]]
+
+
+class WigleBot(discord.Client):
+    # One gateway connection, HTTP session, response cache and rate limiter shared by the
+    # slash commands and the /wigle button menu.
+    def __init__(self, wigle_api_keys):
+        self.low_memory = config.get("low_memory_mode", False)
+        super().__init__(**gateway_options(self.low_memory))
+        self.tree = discord.app_commands.CommandTree(self)
+        self.session = None
+        self.request_timeout = config.get("wigle_timeout_seconds", 15)
+        self.cache = TTLCache(maxsize=config.get("cache_size", 2048))
+        self.metrics = Metrics()
+        self.metrics_task = None
+        self.profiler = CommandProfiler(directory=config.get("profiling_directory", "profiles"),
+                                        sample_rate=config.get("profiling_sample_rate", 0.1),
+                                        enabled=config.get("profiling_enabled", False),
+                                        interval=config.get("profiling_interval_ms", 5) / 1000)
+        self.tracer = Tracer(path=config.get("trace_file"), endpoint=config.get("trace_otlp_endpoint"),
+                             slow_threshold=config.get("trace_slow_seconds", 2.0),
+                             sample_rate=config.get("trace_sample_rate", 0.01), metrics=self.metrics)
+        self.app_owner_ids = None
+        self.loop_monitor = LoopLagMonitor(self.metrics, interval=config.get("loop_monitor_interval_seconds", 0.5),
+                                           threshold=config.get("loop_lag_threshold_seconds", 0.25))
+        # Last good response per resource, served with a "stale since" note while WiGLE is down
+        self.last_good = TTLCache(maxsize=config.get("cache_size", 2048), ttl=config.get("stale_ttl_seconds", 86400))
+        self.breakers = {
+            endpoint: CircuitBreaker(endpoint, threshold=config.get("breaker_failure_threshold", 5),
+                                     cooldown=config.get("breaker_cooldown_seconds", 30), metrics=self.metrics)
+            for endpoint in CACHE_TTLS
+        }
+        self.keys = KeyPool(wigle_api_keys, rate=config.get("wigle_requests_per_minute", 60), per=60,
+                            cooldown=config.get("wigle_key_cooldown_seconds", 60),
+                            rejected_cooldown=config.get("wigle_key_rejected_seconds", 900), metrics=self.metrics)
+        # Every upstream call goes through one limiter so background jobs cannot exhaust the API keys
+        self.api_limiter = RateLimiter(config.get("wigle_requests_per_minute", 60) * len(self.keys), per=60)
+        self.scheduler = FairScheduler(self.api_limiter, user_rate=config.get("user_requests_per_minute", 10),
+                                       guild_rate=config.get("guild_requests_per_minute", 30),
+                                       weights=config.get("guild_weights"),
+                                       background_weight=config.get("background_weight", 1))
+        # Network searches have a much smaller daily allowance than the stats endpoints
+        self.search_limiter = RateLimiter(config.get("wigle_searches_per_day", 100), per=86400,
+                                          burst=config.get("wigle_search_burst", 5))
+        self.nearby = NearbyIndex(precision=config.get("nearby_geohash_precision", 6),
+                                  ttl=config.get("nearby_cache_seconds", CACHE_TTLS["search"]),
+                                  maxsize=config.get("nearby_cache_cells", 4096),
+                                  max_cells=config.get("nearby_max_cells", 256))
+        self.send_limiter = RateLimiter(config.get("digest_sends_per_second", 1), burst=5)
+        self.outbound = outbound
+        self.outbound.configure(rate=config.get("channel_messages_per_5s", 5), per=5.0,
+                                quiet_period=config.get("housekeeping_quiet_seconds", 2.0), metrics=self.metrics)
+        self.history = HistoryStore(config.get("history_file", "history.db"),
+                                    interval=config.get("history_interval_seconds", 3600))
+        self.history_tasks = set()
+        self.charts = ChartRenderer(workers=config.get("chart_workers", 2), metrics=self.metrics)
+        # Every username and group name seen in a response, for suggestions and autocomplete
+        self.usernames = TrigramIndex()
+        self.group_names = TrigramIndex()
+        self.rank_index = RankIndex()
+        self.standings_crawler = StandingsCrawler(self, self.rank_index,
+                                                  tick=config.get("standings_crawl_tick_seconds", 60),
+                                                  pages_per_tick=config.get("standings_crawl_pages_per_tick", 5),
+                                                  max_rank=config.get("standings_crawl_max_rank", 0))
+        self.memberships = MembershipIndex()
+        self.membership_crawler = MembershipCrawler(self, self.memberships,
+                                                    tick=config.get("membership_crawl_tick_seconds", 300),
+                                                    groups_per_tick=config.get("membership_crawl_groups_per_tick", 50),
+                                                    concurrency=config.get("membership_crawl_concurrency", 2))
+        self.region_boards = RegionBoards(self, interval=config.get("region_refresh_seconds", CACHE_TTLS["regions"]),
+                                          countries=config.get("region_countries", 10),
+                                          spacing=config.get("region_request_spacing_seconds", 5))
+        self.checkpoint = Checkpoint(self, config.get("state_directory", "state"), CACHE_TTLS,
+                                     interval=config.get("checkpoint_interval_seconds", 600),
+                                     max_age=config.get("stale_ttl_seconds", 86400))
+        self.subscriptions = SubscriptionStore(config.get("subscriptions_file", "subscriptions.json"))
+        self.digests = DigestScheduler(self, self.subscriptions, self.send_limiter,
+                                       tick=config.get("digest_tick_seconds", 60))
+        self.watchlist = WatchStore(config.get("watchlist_file", "watchlist.json"))
+        self.watch_poller = WatchPoller(self, self.watchlist, self.send_limiter,
+                                        batch_size=config.get("watch_polls_per_minute", 20))
+
+    async def setup_hook(self):
+        self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=self.request_timeout))
+        self.tracer.session = self.session
+        await self.tree.sync()
+        await self.checkpoint.load()
+        self.checkpoint.start()
+        self.digests.start()
+        self.watch_poller.start()
+        self.standings_crawler.start()
+        self.region_boards.start()
+        self.membership_crawler.start()
+        self.metrics_task = asyncio.create_task(self.report_metrics())
+        self.loop_monitor.start()
+
+    async def on_ready(self):
+        logging.info(f"Bot is in {len(self.guilds)} servers")
+
+        for guild in self.guilds:
+            if self.low_memory:
+                # Members are not cached, and fetching every owner is one request per server
+                logging.info(f" - {guild.name} (Owner ID: {guild.owner_id})")
+                continue
+            owner = guild.owner
+            if owner is None:
+                try:
+                    owner = await guild.fetch_member(guild.owner_id)
+                except discord.HTTPException:
+                    owner = "Unable to fetch owner"
+
+            owner_name = owner if isinstance(owner, str) else f"{owner.name}#{owner.discriminator}"
+            logging.info(f" - {guild.name} (Owner: {owner_name})")
+
+        server_count = len(self.guilds)
+        activity_text = f"/wigle on {server_count} servers"
+        await self.change_presence(activity=discord.Activity(type=discord.ActivityType.watching, name=activity_text))
+
+        logging.info(f"Bot {self.user.name} is ready!")
+
+    async def on_raw_message_delete(self, payload):
+        self.outbound.forget(payload.channel_id, payload.message_id)
+
+    async def on_raw_bulk_message_delete(self, payload):
+        for message_id in payload.message_ids:
+            self.outbound.forget(payload.channel_id, message_id)
+
+    async def is_owner(self, user):
+        if config.get("owner_ids"):
+            return user.id in config["owner_ids"]
+        if self.app_owner_ids is None:
+            app = await self.application_info()
+            self.app_owner_ids = {member.id for member in app.team.members} if app.team else {app.owner.id}
+        return user.id in self.app_owner_ids
+
+    async def report_metrics(self):
+        interval = config.get("metrics_interval_seconds", 300)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                self.metrics.export(config.get("metrics_file"))
+            except Exception as e:
+                logging.error(f"Failed to export metrics: {e}")
+
+    async def close(self):
+        try:
+            if self.metrics_task:
+                self.metrics_task.cancel()
+            await self.loop_monitor.stop()
+            await self.digests.stop()
+            await self.watch_poller.stop()
+            await self.standings_crawler.stop()
+            await self.region_boards.stop()
+            await self.membership_crawler.stop()
+            await self.checkpoint.stop()
+            if self.tracer.exports:
+                await asyncio.wait(self.tracer.exports)
+            await super().close()
+        finally:
+            if self.session:
+                await self.session.close()
+            self.charts.close()
+            await self.flush_history()
+            self.history.close()
+
+    async def wigle_get(self, endpoint, req, authenticated=True, deadline=None):
+        headers = {"Cache-Control": "no-cache"}
+        breaker = self.breakers[endpoint]
+        retries = config.get("wigle_retries", 2)
+        for attempt in range(retries + 1):
+            failure = None
+            try:
+                with self.tracer.span("upstream", endpoint=endpoint, attempt=attempt) as span:
+                    status, data = await self.wigle_attempt(breaker, req, headers, deadline, authenticated)
+                    span.attributes["status"] = status
+                if status != 429 and status < 500:
+                    return status, data
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                failure = e
+
+            # Back off before retrying, but only if the caller's budget leaves room for another attempt
+            backoff = RETRY_BACKOFF_SECONDS * 2 ** attempt * random.uniform(0.5, 1.5)
+            if attempt == retries or (deadline is not None and deadline.remaining() < backoff + MIN_ATTEMPT_SECONDS):
+                if failure is not None:
+                    raise failure
+                return status, data
+            await asyncio.sleep(backoff)
+
+    async def wait_for_slot(self, authenticated):
+        with self.tracer.span("wait"):
+            await self.scheduler.acquire(current_tenant.get())
+            return await self.keys.acquire() if authenticated else None
+
+    async def wigle_attempt(self, breaker, req, headers, deadline, authenticated=True):
+        timeout = self.request_timeout
+        if deadline is not None:
+            deadline.check()
+        # Checked before waiting, so an open breaker fails fast without queueing or spending a token
+        breaker.check()
+        try:
+            if deadline is not None:
+                try:
+                    key = await asyncio.wait_for(self.wait_for_slot(authenticated), deadline.remaining())
+                except asyncio.TimeoutError:
+                    raise DeadlineExceeded("budget exhausted waiting for the rate limiter")
+                timeout = min(timeout, deadline.remaining())
+            else:
+                key = await self.wait_for_slot(authenticated)
+        except BaseException:
+            breaker.abandon()
+            raise
+        if key is not None:
+            headers = {**headers, "Authorization": f"Basic {key.secret}"}
+
+        try:
+            async with self.session.get(req, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+                if key is not None:
+                    self.keys.record(key, response.status, response.headers)
+                if response.status == 429 or response.status >= 500:
+                    breaker.record_failure()
+                    return response.status, None
+                breaker.record_success()
+
+                if response.status == 403:
+                    response_text = await response.text()
+                    logging.error(f"403 Forbidden from {req}, Response: {response_text}")
+                    return response.status, None
+                elif response.status != 200:
+                    return response.status, None
+                with self.tracer.span("parse"):
+                    return response.status, await response.json()
+        except asyncio.TimeoutError:
+            # Only a request the deadline left too little time says nothing about WiGLE's health
+            if timeout < HEALTH_PROBE_SECONDS:
+                breaker.abandon()
+            else:
+                breaker.record_failure()
+            if timeout < self.request_timeout:
+                raise DeadlineExceeded("budget exhausted waiting for WiGLE")
+            raise
+        except aiohttp.ClientError:
+            breaker.record_failure()
+            raise
+        except BaseException:
+            breaker.abandon()
+            raise
+
+    def remember(self, key, data):
+        self.cache.set(key, data, CACHE_TTLS[key[0]])
+        self.last_good.set(key, (data, time.time()))
+        self.record_history(key, data)
+        self.index_names(key, data)
+
+    def index_names(self, key, data):
+        if key[0] == "user":
+            self.usernames.add(data["statistics"]["userName"])
+        elif key[0] == "standings":
+            self.usernames.add_many(result["userName"] for result in data["results"])
+        elif key[0] == "groupMembers":
+            self.usernames.add_many(user["username"] for user in data.get("users", []))
+        elif key[0] == "groups":
+            self.group_names.replace(group["groupName"] for group in data["groups"])
+
+    def not_found(self, key, message):
+        # Remembered like a successful response so repeating a typo does not cost another request
+        response = {"success": False, "message": message, "not_found": True}
+        self.cache.set(key, response, CACHE_TTLS[key[0]])
+        return response
+
+    def record_history(self, key, data):
+        now = time.time()
+        if key[0] == "user" and self.history.due(key, now):
+            task = asyncio.create_task(asyncio.to_thread(self.history.record_user, data["statistics"], now))
+        elif key[0] == "groups" and self.history.due(key, now):
+            task = asyncio.create_task(asyncio.to_thread(self.history.record_groups, data["groups"], now))
+        else:
+            return
+        self.history_tasks.add(task)
+        task.add_done_callback(self.history_tasks.discard)
+
+    async def flush_history(self):
+        if self.history_tasks:
+            await asyncio.wait(self.history_tasks)
+
+    def fetched_at(self, key):
+        snapshot = self.last_good.get(key)
+        return snapshot[1] if snapshot is not None else None
+
+    def stale_or_error(self, key, message):
+        snapshot = self.last_good.get(key)
+        if snapshot is None:
+            return {"success": False, "message": message}
+        data, fetched_at = snapshot
+        self.metrics.incr(f"stale.{key[0]}")
+        return {**data, "stale_since": fetched_at}
+
+    async def fetch_wigle_user_stats(self, username: str, cached_only=False, deadline=None):
+        key = ("user", username.lower())
+        cached = self.cache.get(key)
+        if cached is not None or cached_only:
+            return cached
+
+        req = f"https://api.wigle.net/api/v2/stats/user?user={username}&nocache={int(time.time())}"
+        try:
+            status, data = await self.wigle_get("user", req, deadline=deadline)
+            if status == 404:
+                logging.info(f"WiGLE user {username} not found.")
+                return self.not_found(key, "User not found.")
+            elif status != 200:
+                logging.error(f"Error fetching WiGLE user stats for {username}: {status}")
+                return self.stale_or_error(key, f"HTTP error {status}")
+
+            if data and data.get("success") and "statistics" in data and "userName" in data["statistics"]:
+                if data["statistics"]["userName"].lower() == username.lower():
+                    logging.info(f"Fetched WiGLE user stats for {username}")
+                    self.remember(key, data)
+                    return data
+                else:
+                    return self.not_found(key, "User not found.")
+            else:
+                return {"success": False, "message": "Invalid data received or user not found."}
+        except Exception as e:
+            logging.error(f"Failed to fetch WiGLE user stats for {username}: {e}")
+            return self.stale_or_error(key, UNAVAILABLE_MESSAGE)
+
+    async def fetch_wigle_group_rank(self, cached_only=False, deadline=None):
+        key = ("groups",)
+        cached = self.cache.get(key)
+        if cached is not None or cached_only:
+            return cached
+
+        req = f"https://api.wigle.net/api/v2/stats/group?nocache={int(time.time())}"
+        try:
+            status, data = await self.wigle_get("groups", req, deadline=deadline)
+            if status != 200:
+                logging.error(f"Error fetching WiGLE group ranks: {status}")
+                return self.stale_or_error(key, f"HTTP error {status}")
+
+            if data.get("success") and "groups" in data:
+                self.remember(key, data)
+                return data
+            else:
+                return {"success": False, "message": data.get("message", "No group data available.")}
+        except Exception as e:
+            logging.error(f"Failed to fetch WiGLE group ranks: {e}")
+            return self.stale_or_error(key, UNAVAILABLE_MESSAGE)
+
+    async def fetch_wigle_id(self, group_name: str, cached_only=False, deadline=None):
+        # Resolved from the cached group list, so /userrank does not download it a second time.
+        # The list of names from the last download answers misses without downloading it at all.
+        if (not self.group_names.exact(group_name) and self.cache.get(("groups",)) is None
+                and time.time() - self.group_names.updated < config.get("group_names_trusted_seconds", 3600)):
+            return {"success": False, "message": f"No group named '{group_name}' found.", "not_found": True}
+
+        response = await self.fetch_wigle_group_rank(cached_only=cached_only, deadline=deadline)
+        if response is None:
+            return None
+        if not response.get("success"):
+            logging.warning(f"WiGLE group ID fetch error for '{group_name}': {response.get('message')}")
+            return response
+
+        for group in response["groups"]:
+            if group["groupName"] == group_name:
+                group_id = group["groupId"]
+                url = f"https://api.wigle.net/api/v2/group/groupMembers?groupid={group_id}"
+                return {"success": True, "groupId": group_id, "url": url}
+
+        return {"success": False, "message": f"No group named '{group_name}' found.", "not_found": True}
+
+    async def fetch_group_members(self, group_id, cached_only=False, deadline=None):
+        key = ("groupMembers", group_id)
+        cached = self.cache.get(key)
+        if cached is not None or cached_only:
+            return cached
+
+        url = f"https://api.wigle.net/api/v2/group/groupMembers?groupid={group_id}"
+        try:
+            status, data = await self.wigle_get("groupMembers", url, authenticated=False, deadline=deadline)
+            if status != 200:
+                logging.error(f"Error fetching user rank from URL: {url}, HTTP error {status}")
+                return self.stale_or_error(key, "Failed to fetch group data from the URL.")
+
+            self.remember(key, data)
+            return data
+        except Exception as e:
+            logging.error(f"Failed to fetch user rank from URL: {url}, {e}")
+            return self.stale_or_error(key, UNAVAILABLE_MESSAGE)
+
+    async def fetch_standings(self, sort, cached_only=False, deadline=None):
+        key = ("standings", sort)
+        cached = self.cache.get(key)
+        if cached is not None or cached_only:
+            return cached
+
+        req = f"https://api.wigle.net/api/v2/stats/standings?sort={sort}&pagestart=0"
+        try:
+            status, data = await self.wigle_get("standings", req, deadline=deadline)
+            if status != 200:
+                logging.error(f"Error fetching WiGLE {sort} standings: {status}")
+                return self.stale_or_error(key, f"HTTP error {status}")
+
+            if data.get("success") and "results" in data:
+                # Remove the user named "Anonymous" from the results
+                data["results"] = [result for result in data["results"] if result["userName"] != "anonymous"]
+                self.remember(key, data)
+                return data
+            else:
+                return {"success": False, "message": data.get("message", "No rank data available.")}
+        except Exception as e:
+            logging.error(f"Failed to fetch WiGLE {sort} standings: {e}")
+            return self.stale_or_error(key, UNAVAILABLE_MESSAGE)
+
+    async def fetch_wigle_alltime_rank(self, cached_only=False, deadline=None):
+        return await self.fetch_standings("discovered", cached_only=cached_only, deadline=deadline)
+
+    async def fetch_wigle_month_rank(self, cached_only=False, deadline=None):
+        return await self.fetch_standings("monthcount", cached_only=cached_only, deadline=deadline)
+
+    async def fetch_nearby(self, lat, lon, radius, cells, cached_only=False, deadline=None):
+        # `radius` and `cells` come from self.nearby.plan()
+        if cells is None:
+            return {"success": False, "message": "That point is too close to a pole to search around."}
+        missing = self.nearby.missing(cells)
+        if not missing:
+            result = self.nearby.query(lat, lon, radius, cells)
+            if result is not None:
+                self.metrics.incr("nearby.hit")
+                return {**result, "radius": radius}
+            missing = self.nearby.missing(cells)
+        if cached_only:
+            return None
+
+        # Only the cells no earlier search covered are searched, in one box per side of the antimeridian
+        boxes = self.nearby.search_boxes(missing)
+        retry_after = self.search_limiter.try_acquire(len(boxes))
+        if retry_after:
+            self.metrics.incr("nearby.quota_exhausted")
+            return {"success": False, "message": f"The network search allowance is used up, please try again "
+                                                 f"<t:{int(time.time() + retry_after)}:R>."}
+        self.metrics.incr("nearby.miss")
+        per_page = config.get("nearby_results_per_search", 100)
+        try:
+            for south, west, north, east in boxes:
+                req = (f"https://api.wigle.net/api/v2/network/search?onlymine=false&latrange1={south}"
+                       f"&latrange2={north}&longrange1={west}&longrange2={east}&resultsPerPage={per_page}")
+                status, data = await self.wigle_get("search", req, deadline=deadline)
+                if status != 200:
+                    logging.error(f"Error searching WiGLE networks near {lat},{lon}: {status}")
+                    return {"success": False, "message": f"HTTP error {status}"}
+                if not data.get("success") or "results" not in data:
+                    return {"success": False, "message": data.get("message", "No network data available.")}
+
+                networks = [network for network in data["results"]
+                            if network.get("trilat") is not None and network.get("trilong") is not None]
+                self.nearby.store((south, west, north, east), networks,
+                                  data.get("totalResults", 0) > len(data["results"]))
+            logging.info(f"Searched WiGLE networks in {len(missing)} cells near {lat},{lon}")
+        except Exception as e:
+            logging.error(f"Failed to search WiGLE networks near {lat},{lon}: {e}")
+            return {"success": False, "message": UNAVAILABLE_MESSAGE}
+
+        result = self.nearby.query(lat, lon, radius, cells)
+        if result is None:
+            return {"success": False, "message": "The search results could not be kept, please try again."}
+        return {**result, "radius": radius}
+
+
+client = WigleBot(wigle_api_keys=wigle_api_keys)
+
+
+async def start_discord_bot():
+    # Ctrl+C and SIGTERM cancel this task, and leaving `async with client` runs close() on the same
+    # loop, so the final checkpoint is written and the HTTP session is closed cleanly.
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, task.cancel)
+        except NotImplementedError:
+            pass
+
+    async with client:
+        await client.start(config["discord_bot_token"])
+
+
+def run_discord_bot():
+    try:
+        asyncio.run(start_discord_bot())
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        logging.info("Bot stopped.")
+    except Exception as e:
+        logging.error(f"An error occurred while running the bot: {e}")
+    finally:
+        log_listener.stop()